@@ -20,7 +20,7 @@ target_metadata = Base.metadata
 
 
 def get_url():
-    return settings.database_url
+    return settings.async_database_url
 
 
 def run_migrations_offline() -> None:
@@ -0,0 +1,35 @@
+"""add_overlay_zone_levels_index
+
+Revision ID: 3b7e2d9a4c61
+Revises: f8cdd7a90887
+Create Date: 2026-10-16
+
+Partial index backing the zone-level lookup used when publishing
+(distinct source_level of non-zone overlays per project).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e2d9a4c61'
+down_revision: Union[str, None] = 'f8cdd7a90887'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_overlays_zone_levels',
+        'overlays',
+        ['project_id', 'source_level'],
+        postgresql_where=sa.text(
+            "overlay_type <> 'zone' AND source_level IS NOT NULL AND source_level <> 'project'"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_overlays_zone_levels', table_name='overlays')
@@ -283,8 +283,8 @@ async def import_svg_overlays(
             detail=f"Failed to read SVG file: {str(e)}"
         )
 
-    # Parse SVG
-    parsed = svg_parser.parse_svg(svg_content, id_pattern=id_pattern)
+    # Parse SVG (paths and viewBox in one pass)
+    view_box, _, _, parsed = svg_parser.parse_svg_full(svg_content, id_pattern=id_pattern)
 
     if not parsed:
         return {
@@ -303,9 +303,6 @@ async def import_svg_overlays(
         layer=layer,
     )
 
-    # Get viewBox from SVG
-    view_box = svg_parser.get_viewbox(svg_content)
-
     # Convert dicts to BulkOverlayItem models
     overlays = [
         BulkOverlayItem(
@@ -1081,9 +1081,11 @@ async def import_view_overlays_from_svg(
             detail="View not found"
         )
 
-    # Parse SVG
+    # Parse SVG (paths and viewBox in one pass)
     try:
-        parsed = svg_parser.parse_svg(data.svg_content, id_pattern=data.id_pattern)
+        view_box, _, _, parsed = svg_parser.parse_svg_full(
+            data.svg_content, id_pattern=data.id_pattern
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1100,9 +1102,6 @@ async def import_view_overlays_from_svg(
             "message": "No matching paths found in SVG",
         }
 
-    # Get viewBox from SVG
-    view_box = svg_parser.get_viewbox(data.svg_content)
-
     # Update view's viewBox if found
     if view_box and not view.view_box:
         from app.schemas.building import BuildingViewUpdate
@@ -1,4 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from app.lib.database import pool_status
+from app.lib.deps import require_admin
+from app.models.user import User
 
 router = APIRouter()
 
@@ -6,3 +10,11 @@ router = APIRouter()
 @router.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "admin-api"}
+
+
+@router.get("/health/pool")
+async def pool_health(
+    current_user: User = Depends(require_admin),
+):
+    """Connection pool sizing and usage (admin only)."""
+    return pool_status()
@@ -141,7 +141,7 @@ async def create_version(
     Optionally clone from an existing version.
     """
     service = ProjectService(db)
-    project = await service.get_project_by_slug(slug)
+    project = await service.get_project_by_slug_light(slug)
 
     if not project:
         raise HTTPException(
@@ -184,7 +184,7 @@ async def get_version(
     Get a specific version of a project.
     """
     service = ProjectService(db)
-    project = await service.get_project_by_slug(slug)
+    project = await service.get_project_by_slug_light(slug)
 
     if not project:
         raise HTTPException(
@@ -216,7 +216,7 @@ async def delete_version(
     Only draft versions can be deleted. Published versions are immutable.
     """
     service = ProjectService(db)
-    project = await service.get_project_by_slug(slug)
+    project = await service.get_project_by_slug_light(slug)
 
     if not project:
         raise HTTPException(
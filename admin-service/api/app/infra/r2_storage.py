@@ -3,10 +3,12 @@ Cloudflare R2 Storage Adapter
 
 Provides low-level S3-compatible storage operations for Cloudflare R2.
 """
+import asyncio
 import hashlib
 import hmac
 import time
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import boto3
 from botocore.config import Config
@@ -71,7 +73,52 @@ class R2StorageAdapter:
     ) -> Dict[str, Any]:
         """Upload file to storage."""
         self._ensure_bucket_exists()
+        return self.put_file(key, body, content_type, metadata)
 
+    async def upload_local_files(
+        self,
+        files: Iterable[Tuple[str, Path, str]],
+        concurrency: int,
+    ) -> int:
+        """
+        Upload local files concurrently.
+
+        Args:
+            files: (key, local_path, content_type) tuples
+            concurrency: Max uploads in flight at once
+
+        The bucket is checked once up front. Each file is read and PUT in a
+        worker thread (the boto3 client blocks and is thread-safe), and
+        failures raise the same errors as upload_file.
+
+        Returns:
+            Number of files uploaded
+        """
+        await asyncio.to_thread(self._ensure_bucket_exists)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def upload_one(key: str, local_path: Path, content_type: str) -> None:
+            async with semaphore:
+                await asyncio.to_thread(
+                    self._put_local_file, key, local_path, content_type
+                )
+
+        uploads = [upload_one(*file) for file in files]
+        await asyncio.gather(*uploads)
+        return len(uploads)
+
+    def _put_local_file(self, key: str, local_path: Path, content_type: str) -> None:
+        """Read a local file and PUT it (blocking)."""
+        self.put_file(key, local_path.read_bytes(), content_type)
+
+    def put_file(
+        self,
+        key: str,
+        body: bytes,
+        content_type: str,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """PUT an object without the bucket check (blocking; call from a thread)."""
         try:
             params = {
                 'Bucket': self.bucket,
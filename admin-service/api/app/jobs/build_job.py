@@ -163,12 +163,11 @@ async def run_build_job(
         await job_service.update_progress(job_id, 85, "Uploading manifest...")
 
         # Upload manifest
-        manifest_json = manifest.model_dump_json(indent=2)
         manifest_key = f"{build_path}/release.json"
 
         await storage_service.storage.upload_file(
             key=manifest_key,
-            body=manifest_json.encode(),
+            body=release_service.manifest_to_bytes(manifest),
             content_type="application/json",
         )
 
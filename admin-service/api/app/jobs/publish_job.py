@@ -242,20 +242,10 @@ async def run_publish_job(
             await job_service.fail_job(job_id, "Failed to build release manifest")
             return {"error": "Failed to build manifest"}
 
-        await job_service.update_progress(job_id, 70, "Uploading project manifest...")
-
-        # Upload main release.json (project level)
-        manifest_json = manifest.model_dump_json(indent=2)
+        # Main release.json (project level) is serialized and uploaded once,
+        # after zone and building references have been attached
         manifest_key = f"{release_path}/release.json"
 
-        await storage_service.storage.upload_file(
-            key=manifest_key,
-            body=manifest_json.encode(),
-            content_type="application/json",
-        )
-
-        await job_service.add_log(job_id, f"Uploaded project manifest with {len(manifest.overlays)} zones", "info")
-
         # Get zone levels that have content
         zone_levels = await release_service.get_zone_levels(project_slug)
         zone_manifests_uploaded = 0
@@ -282,12 +272,11 @@ async def run_publish_job(
 
                 if zone_manifest and zone_manifest.overlays:
                     # Upload zone manifest to /zones/{zone-level}.json
-                    zone_manifest_json = zone_manifest.model_dump_json(indent=2)
                     zone_manifest_key = f"{release_path}/zones/{zone_level}.json"
 
                     await storage_service.storage.upload_file(
                         key=zone_manifest_key,
-                        body=zone_manifest_json.encode(),
+                        body=release_service.manifest_to_bytes(zone_manifest),
                         content_type="application/json",
                     )
 
@@ -316,16 +305,9 @@ async def run_publish_job(
                         "info"
                     )
 
-        # Add zone info to project manifest and re-upload
+        # Add zone info to project manifest
         if zone_info_list:
             manifest.zones = zone_info_list
-            manifest_json = manifest.model_dump_json(indent=2)
-            await storage_service.storage.upload_file(
-                key=manifest_key,
-                body=manifest_json.encode(),
-                content_type="application/json",
-            )
-            await job_service.add_log(job_id, f"Updated project manifest with {len(zone_info_list)} zone references", "info")
 
         # Generate building manifests and overlay files
         building_release_service = BuildingReleaseService(db)
@@ -375,18 +357,25 @@ async def run_publish_job(
                         "error"
                     )
 
-        # Add building info to project manifest and re-upload
+        # Add building info to project manifest
         if building_info_list:
             manifest.buildings = building_info_list
-            manifest_json = manifest.model_dump_json(indent=2)
-            await storage_service.storage.upload_file(
-                key=manifest_key,
-                body=manifest_json.encode(),
-                content_type="application/json",
-            )
-            await job_service.add_log(job_id, f"Updated project manifest with {len(building_info_list)} building references", "info")
 
-        await job_service.update_progress(job_id, 85, "Finalizing manifests...")
+        await job_service.update_progress(job_id, 85, "Uploading project manifest...")
+
+        # Upload main release.json (project level)
+        await storage_service.storage.upload_file(
+            key=manifest_key,
+            body=release_service.manifest_to_bytes(manifest),
+            content_type="application/json",
+        )
+
+        await job_service.add_log(
+            job_id,
+            f"Uploaded project manifest with {len(manifest.overlays)} zones, "
+            f"{len(manifest.zones)} zone references and {len(manifest.buildings)} building references",
+            "info"
+        )
 
         # Get release URL
         release_url = storage_service.storage.get_public_url(manifest_key)
@@ -14,6 +14,9 @@ from app.services.job_service import JobService
 from app.services.tile_service import tile_service
 from app.services.storage_service import storage_service
 
+# Tiles uploaded between progress updates
+UPLOAD_BATCH_SIZE = 100
+
 
 async def run_tile_generation_job(
     db: AsyncSession,
@@ -77,29 +80,23 @@ async def run_tile_generation_job(
 
             # Upload tiles to staging
             tiles_key_prefix = f"mp/{project_slug}/uploads/tiles/"
+            tile_files = list(tiles_dir.rglob(f"*.{result['format']}"))
             tile_count = 0
 
-            for tile_file in tiles_dir.rglob(f"*.{result['format']}"):
-                relative_path = tile_file.relative_to(tiles_dir)
-                key = f"{tiles_key_prefix}{relative_path}"
-
-                with open(tile_file, "rb") as f:
-                    content_type = f"image/{result['format']}"
-                    await storage_service.storage.upload_file(
-                        key=key,
-                        body=f.read(),
-                        content_type=content_type,
-                    )
-                tile_count += 1
-
-                # Update progress periodically
-                if tile_count % 100 == 0:
-                    progress = 80 + int((tile_count / result["tile_count"]) * 15)
-                    await service.update_progress(
-                        job_id,
-                        min(95, progress),
-                        f"Uploading tiles... ({tile_count}/{result['tile_count']})"
-                    )
+            # Upload concurrently in batches, updating progress after each
+            for start in range(0, len(tile_files), UPLOAD_BATCH_SIZE):
+                tile_count += await storage_service.upload_tiles(
+                    tiles_key_prefix,
+                    tiles_dir,
+                    tile_files[start:start + UPLOAD_BATCH_SIZE],
+                )
+
+                progress = 80 + int((tile_count / result["tile_count"]) * 15)
+                await service.update_progress(
+                    job_id,
+                    min(95, progress),
+                    f"Uploading tiles... ({tile_count}/{result['tile_count']})"
+                )
 
             await service.update_progress(job_id, 95, "Finalizing...")
 
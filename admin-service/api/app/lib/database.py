@@ -8,10 +8,25 @@ class Base(DeclarativeBase):
     pass
 
 
+# asyncpg with the default AsyncAdaptedQueuePool
 engine = create_async_engine(
-    settings.database_url,
+    settings.async_database_url,
     echo=False,
     future=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    connect_args={
+        # Server-side keepalives so idle pooled connections aren't dropped silently
+        "server_settings": {"tcp_keepalives_idle": "60"},
+        # Prepared statements reused per connection for repeated lookups
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+    },
+    # Room for every distinct statement shape the services compile
+    query_cache_size=1200,
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -24,6 +39,18 @@ AsyncSessionLocal = async_sessionmaker(
 async_session_maker = AsyncSessionLocal
 
 
+def pool_status() -> dict:
+    """Current connection pool usage, for spotting exhaustion early."""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.db_max_overflow,
+    }
+
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         try:
@@ -0,0 +1,34 @@
+"""
+Shared outbound HTTP client.
+
+A single pooled httpx.AsyncClient reused across requests so calls to
+client APIs keep their TCP/TLS connections alive instead of paying a new
+handshake per call. Closed on application shutdown.
+"""
+from typing import Optional
+
+import httpx
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _client
+
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=httpx.Timeout(10.0),
+        )
+
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client (called from the app lifespan)."""
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
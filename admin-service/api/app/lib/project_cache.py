@@ -0,0 +1,78 @@
+"""
+Project slug cache.
+
+Maps project slugs to IDs so services can resolve a project with a
+primary-key lookup (served from the session identity map on repeat calls)
+instead of a SELECT by slug on every call.
+
+The cache is per-process with a short TTL. Entries are always re-validated
+against the loaded row, so a stale entry can only cost an extra query,
+never return the wrong project.
+"""
+import time
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.project import Project
+
+# Seconds a slug -> project_id entry stays valid
+SLUG_CACHE_TTL = 60.0
+
+_slug_to_id: Dict[str, Tuple[UUID, float]] = {}
+
+_ACTIVE_PROJECT_BY_SLUG = select(Project).where(
+    Project.slug == bindparam("slug"),
+    Project.is_active == True
+)
+
+
+def get_project_id_by_slug(slug: str) -> Optional[UUID]:
+    """Get a cached project ID for a slug, or None if missing/expired."""
+    entry = _slug_to_id.get(slug)
+    if entry is None:
+        return None
+
+    project_id, expires_at = entry
+    if expires_at < time.monotonic():
+        _slug_to_id.pop(slug, None)
+        return None
+
+    return project_id
+
+
+def set_project_id(slug: str, project_id: UUID) -> None:
+    """Cache the project ID for a slug."""
+    _slug_to_id[slug] = (project_id, time.monotonic() + SLUG_CACHE_TTL)
+
+
+def invalidate_project_slug(slug: str) -> None:
+    """Drop a slug from the cache (call after project mutations)."""
+    _slug_to_id.pop(slug, None)
+
+
+async def get_active_project_by_slug(
+    db: AsyncSession,
+    slug: str,
+) -> Optional[Project]:
+    """
+    Get an active project by slug, using the slug cache when possible.
+
+    A cache hit becomes a primary-key lookup via `session.get()`, which
+    does not query the database again within the same session.
+    """
+    project_id = get_project_id_by_slug(slug)
+    if project_id is not None:
+        project = await db.get(Project, project_id)
+        if project and project.slug == slug and project.is_active:
+            return project
+        invalidate_project_slug(slug)
+
+    project = await db.scalar(_ACTIVE_PROJECT_BY_SLUG, {"slug": slug})
+
+    if project:
+        set_project_id(slug, project.id)
+
+    return project
@@ -5,11 +5,13 @@ Provides pub/sub for real-time updates to connected clients.
 Used for job progress streaming and status updates.
 """
 import asyncio
-import json
 import time
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Any, AsyncGenerator, Dict, Optional, Set
+from functools import cached_property
+from typing import Any, AsyncGenerator, Dict, Optional, Set, Tuple
+
+import orjson
 
 
 @dataclass
@@ -20,31 +22,49 @@ class SSEMessage:
     id: Optional[str] = None
     retry: Optional[int] = None
 
-    def encode(self) -> str:
-        """Encode message to SSE format."""
+    @cached_property
+    def encoded(self) -> bytes:
+        """
+        SSE wire format, built once per message.
+
+        Broadcasts put the same message on every subscriber queue, so all
+        subscribers share these bytes instead of re-encoding per client.
+        """
         lines = []
 
         if self.id:
-            lines.append(f"id: {self.id}")
+            lines.append(f"id: {self.id}".encode())
 
         if self.event != "message":
-            lines.append(f"event: {self.event}")
+            lines.append(f"event: {self.event}".encode())
 
         if self.retry:
-            lines.append(f"retry: {self.retry}")
+            lines.append(f"retry: {self.retry}".encode())
 
         # Data must be JSON encoded
-        data_str = json.dumps(self.data)
-        lines.append(f"data: {data_str}")
+        lines.append(b"data: " + orjson.dumps(self.data))
 
         # SSE messages end with double newline
-        return "\n".join(lines) + "\n\n"
+        return b"\n".join(lines) + b"\n\n"
+
+    def encode(self) -> bytes:
+        """Encode message to SSE format."""
+        return self.encoded
 
 
-@dataclass
+_PING = SSEMessage(data={}, event="ping")
+
+
+# Max messages buffered per subscriber before the oldest are dropped
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+@dataclass(eq=False)
 class Subscriber:
-    """SSE subscriber with queue."""
-    queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+    """SSE subscriber with bounded queue."""
+    queue: asyncio.Queue = field(
+        default_factory=lambda: asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+    )
     created_at: float = field(default_factory=time.time)
 
 
@@ -61,6 +81,11 @@ class SSEManager:
         self._channels: Dict[str, Set[Subscriber]] = defaultdict(set)
         self._lock = asyncio.Lock()
 
+        # Coalesced broadcast state, keyed by (channel, key)
+        self._pending: Dict[Tuple[str, str], SSEMessage] = {}
+        self._last_sent: Dict[Tuple[str, str], float] = {}
+        self._flush_tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+
     async def subscribe(self, channel: str) -> Subscriber:
         """Subscribe to a channel. Returns subscriber with queue."""
         subscriber = Subscriber()
@@ -77,6 +102,7 @@ class SSEManager:
             # Clean up empty channels
             if not self._channels[channel]:
                 del self._channels[channel]
+                self.drop_coalesced(channel)
 
     async def broadcast(self, channel: str, message: SSEMessage) -> int:
         """
@@ -89,15 +115,82 @@ class SSEManager:
 
         count = 0
         for subscriber in subscribers:
+            queue = subscriber.queue
+            if queue.full():
+                # Slow client: drop its oldest message rather than buffer
+                # without bound (newer job updates supersede older ones)
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
             try:
-                await subscriber.queue.put(message)
+                queue.put_nowait(message)
                 count += 1
-            except Exception:
-                # Queue might be full or subscriber disconnected
+            except asyncio.QueueFull:
                 pass
 
         return count
 
+    async def broadcast_coalesced(
+        self,
+        channel: str,
+        message: SSEMessage,
+        key: str = "progress",
+        min_interval: float = 0.1,
+    ) -> int:
+        """
+        Broadcast at most once per min_interval for (channel, key).
+
+        Messages arriving inside the interval replace each other and only
+        the latest is sent when it elapses. Returns number of subscribers
+        reached now (0 when deferred or nobody is listening).
+        """
+        if channel not in self._channels:
+            return 0
+
+        slot = (channel, key)
+        now = time.monotonic()
+        last = self._last_sent.get(slot)
+
+        if slot not in self._flush_tasks and (last is None or now - last >= min_interval):
+            self._last_sent[slot] = now
+            return await self.broadcast(channel, message)
+
+        self._pending[slot] = message
+        if slot not in self._flush_tasks:
+            delay = min_interval - (now - last)
+            self._flush_tasks[slot] = asyncio.create_task(
+                self._flush_coalesced(slot, delay)
+            )
+
+        return 0
+
+    async def _flush_coalesced(self, slot: Tuple[str, str], delay: float) -> None:
+        """Send the latest pending message for a slot after delay."""
+        await asyncio.sleep(delay)
+
+        self._flush_tasks.pop(slot, None)
+        message = self._pending.pop(slot, None)
+        if message is not None:
+            self._last_sent[slot] = time.monotonic()
+            await self.broadcast(slot[0], message)
+
+    def drop_coalesced(self, channel: str) -> None:
+        """Discard pending coalesced messages and state for a channel."""
+        for slot in [s for s in self._last_sent if s[0] == channel]:
+            del self._last_sent[slot]
+        for slot in [s for s in self._pending if s[0] == channel]:
+            del self._pending[slot]
+        for slot in [s for s in self._flush_tasks if s[0] == channel]:
+            self._flush_tasks.pop(slot).cancel()
+
+    async def get_queue_depth(self, channel: str) -> int:
+        """Get the deepest subscriber queue on channel (backpressure gauge)."""
+        async with self._lock:
+            subscribers = list(self._channels.get(channel, set()))
+
+        return max((s.queue.qsize() for s in subscribers), default=0)
+
     async def get_subscriber_count(self, channel: str) -> int:
         """Get number of active subscribers on channel."""
         async with self._lock:
@@ -108,7 +201,7 @@ class SSEManager:
         channel: str,
         ping_interval: int = 30,
         initial_message: Optional[SSEMessage] = None,
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """
         Generate SSE stream for a channel.
 
@@ -120,7 +213,7 @@ class SSEManager:
         try:
             # Send initial message if provided
             if initial_message:
-                yield initial_message.encode()
+                yield initial_message.encoded
 
             while True:
                 try:
@@ -129,7 +222,7 @@ class SSEManager:
                         subscriber.queue.get(),
                         timeout=ping_interval
                     )
-                    yield message.encode()
+                    yield message.encoded
 
                     # Check if this was a terminal event
                     if message.event in ("completed", "failed", "cancelled"):
@@ -137,8 +230,7 @@ class SSEManager:
 
                 except asyncio.TimeoutError:
                     # Send ping to keep connection alive
-                    ping = SSEMessage(data={}, event="ping")
-                    yield ping.encode()
+                    yield _PING.encoded
 
         finally:
             await self.unsubscribe(channel, subscriber)
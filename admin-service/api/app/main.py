@@ -1,7 +1,10 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.lib.config import settings
+from app.lib.http_client import close_client
 from app.features.health.routes import router as health_router
 from app.features.auth.routes import router as auth_router
 from app.features.projects.routes import router as projects_router
@@ -14,11 +17,19 @@ from app.features.tiles.routes import router as tiles_router
 from app.features.publish.routes import router as publish_router
 from app.features.buildings.routes import router as buildings_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await close_client()
+
+
 app = FastAPI(
     title="Master Plan Admin API",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
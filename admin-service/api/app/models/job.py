@@ -8,6 +8,22 @@ from sqlalchemy.orm import relationship
 from app.lib.database import Base
 
 
+def format_log_entry(entry: dict) -> dict:
+    """
+    Render a stored log entry for API output.
+
+    Entries store the time as epoch nanoseconds under "t"; older entries
+    already carry an ISO "timestamp" and pass through unchanged.
+    """
+    if "t" not in entry:
+        return entry
+    return {
+        "timestamp": datetime.utcfromtimestamp(entry["t"] / 1e9).isoformat(),
+        "level": entry.get("level"),
+        "message": entry.get("message"),
+    }
+
+
 class Job(Base):
     """
     Background job tracking.
@@ -65,7 +81,7 @@ class Job(Base):
             "message": self.message,
             "result": self.result,
             "error": self.error,
-            "logs": self.logs or [],
+            "logs": [format_log_entry(entry) for entry in self.logs or []],
             "project_id": str(self.project_id),
             "version_id": str(self.version_id) if self.version_id else None,
             "created_by": str(self.created_by),
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, UniqueConstraint, Index
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, UniqueConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 
@@ -49,4 +49,10 @@ class Overlay(Base):
         Index('ix_overlays_type', 'overlay_type'),
         Index('ix_overlays_ref', 'ref'),
         Index('ix_overlays_status', 'status'),
+        Index(
+            'ix_overlays_zone_levels', 'project_id', 'source_level',
+            postgresql_where=text(
+                "overlay_type <> 'zone' AND source_level IS NOT NULL AND source_level <> 'project'"
+            ),
+        ),
     )
@@ -4,7 +4,9 @@ from enum import Enum
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from app.models.job import format_log_entry
 
 
 class JobType(str, Enum):
@@ -29,6 +31,14 @@ class LogEntry(BaseModel):
     level: str
     message: str
 
+    @model_validator(mode="before")
+    @classmethod
+    def format_stored_time(cls, data: Any) -> Any:
+        """Convert the stored epoch-nanosecond "t" into an ISO timestamp."""
+        if isinstance(data, dict):
+            return format_log_entry(data)
+        return data
+
 
 class JobResponse(BaseModel):
     """Job response schema."""
@@ -12,7 +12,7 @@ import mimetypes
 from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import func, select, delete
+from sqlalchemy import exists, func, select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.asset import Asset
@@ -42,13 +42,12 @@ class AssetService:
 
     async def has_draft_version(self, project_id: UUID) -> bool:
         """Check if project has a draft version (allows modifications)."""
-        result = await self.db.execute(
-            select(ProjectVersion).where(
+        return await self.db.scalar(
+            select(exists().where(
                 ProjectVersion.project_id == project_id,
                 ProjectVersion.status == "draft"
-            )
+            ))
         )
-        return result.scalar_one_or_none() is not None
 
     async def generate_upload_url(
         self,
@@ -0,0 +1,54 @@
+"""
+Batch fetch helpers.
+
+Load many rows by ref with a single IN query, keyed by ref, so bulk
+endpoints can validate every item against one prefetched dict instead of
+issuing a lookup per item.
+"""
+from typing import Dict, Iterable
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.building_stack import BuildingStack
+from app.models.building_unit import BuildingUnit
+
+
+async def batch_fetch_stacks_by_ref(
+    db: AsyncSession,
+    building_id: UUID,
+    refs: Iterable[str],
+) -> Dict[str, BuildingStack]:
+    """Get a building's stacks for the given refs, keyed by ref."""
+    refs = set(refs)
+    if not refs:
+        return {}
+
+    result = await db.execute(
+        select(BuildingStack).where(
+            BuildingStack.building_id == building_id,
+            BuildingStack.ref.in_(refs)
+        )
+    )
+    return {stack.ref: stack for stack in result.scalars()}
+
+
+async def batch_fetch_units_by_ref(
+    db: AsyncSession,
+    building_id: UUID,
+    refs: Iterable[str],
+) -> Dict[str, BuildingUnit]:
+    """Get a building's units for the given refs, keyed by ref."""
+    refs = set(refs)
+    if not refs:
+        return {}
+
+    result = await db.execute(
+        select(BuildingUnit).where(
+            BuildingUnit.building_id == building_id,
+            BuildingUnit.ref.in_(refs)
+        )
+    )
+    return {unit.ref: unit for unit in result.scalars()}
+
@@ -6,10 +6,11 @@ Handles building CRUD operations including views, stacks, units, and overlay map
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, exists, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.lib.project_cache import get_active_project_by_slug
 from app.models.building import Building
 from app.models.building_view import BuildingView
 from app.models.building_stack import BuildingStack
@@ -31,6 +32,7 @@ from app.schemas.building import (
     BulkOverlayMappingItem,
     ViewType,
 )
+from app.services.batch import batch_fetch_stacks_by_ref, batch_fetch_units_by_ref
 
 
 class BuildingService:
@@ -45,23 +47,16 @@ class BuildingService:
 
     async def get_project_by_slug(self, project_slug: str) -> Optional[Project]:
         """Get project by slug."""
-        result = await self.db.execute(
-            select(Project).where(
-                Project.slug == project_slug,
-                Project.is_active == True
-            )
-        )
-        return result.scalar_one_or_none()
+        return await get_active_project_by_slug(self.db, project_slug)
 
     async def has_draft_version(self, project_id: UUID) -> bool:
         """Check if project has a draft version (allows modifications)."""
-        result = await self.db.execute(
-            select(ProjectVersion).where(
+        return await self.db.scalar(
+            select(exists().where(
                 ProjectVersion.project_id == project_id,
                 ProjectVersion.status == "draft"
-            ).limit(1)
+            ))
         )
-        return result.scalar_one_or_none() is not None
 
     async def get_building_by_ref(
         self,
@@ -69,13 +64,78 @@ class BuildingService:
         ref: str,
     ) -> Optional[Building]:
         """Get building by project and ref."""
-        result = await self.db.execute(
+        return await self.db.scalar(
             select(Building).where(
                 Building.project_id == project_id,
                 Building.ref == ref
             )
         )
-        return result.scalar_one_or_none()
+
+    async def _update_returning(
+        self,
+        model: Any,
+        row_id: UUID,
+        values: Dict[str, Any],
+    ) -> Any:
+        """
+        Apply column values to a row with a single UPDATE ... RETURNING.
+
+        Replaces the setattr + flush + refresh sequence; the returned row
+        also refreshes any instance of it already in the session.
+        """
+        result = await self.db.execute(
+            update(model)
+            .where(model.id == row_id)
+            .values({getattr(model, field): value for field, value in values.items()})
+            .returning(model)
+            .execution_options(populate_existing=True)
+        )
+        row = result.scalar_one_or_none()
+        await self.db.commit()
+        return row
+
+    async def _delete_returning(self, model: Any, *criteria: Any) -> bool:
+        """
+        Delete a row with a single DELETE ... RETURNING id.
+
+        Child rows are removed by the ON DELETE CASCADE foreign keys, so the
+        row never has to be loaded into the session first.
+        """
+        result = await self.db.execute(
+            delete(model).where(*criteria).returning(model.id)
+        )
+        deleted = result.first() is not None
+        await self.db.commit()
+        return deleted
+
+    async def _resolve_draft_building(
+        self,
+        project_slug: str,
+        building_id: UUID,
+    ) -> Optional[Building]:
+        """
+        Resolve the building for a bulk write in a single pass.
+
+        Looks up the project once, checks it has a draft version and loads
+        the building scoped to it. Returns None if any step fails.
+        """
+        project = await self.get_project_by_slug(project_slug)
+        if not project:
+            return None
+
+        if not await self.has_draft_version(project.id):
+            return None
+
+        return await self.db.scalar(
+            select(Building).where(
+                Building.id == building_id,
+                Building.project_id == project.id
+            )
+        )
+
+    def _project_building_ids(self, project_id: UUID):
+        """Subquery of building IDs owned by a project."""
+        return select(Building.id).where(Building.project_id == project_id)
 
     # ============================================
     # BUILDING CRUD
@@ -121,13 +181,12 @@ class BuildingService:
         if not project:
             return None
 
-        result = await self.db.execute(
+        return await self.db.scalar(
             select(Building).where(
                 Building.id == building_id,
                 Building.project_id == project.id
             )
         )
-        return result.scalar_one_or_none()
 
     async def create_building(
         self,
@@ -186,16 +245,14 @@ class BuildingService:
                 return None
 
         update_data = data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            if field == "metadata":
-                setattr(building, "metadata_", value)
-            else:
-                setattr(building, field, value)
+        if "metadata" in update_data:
+            update_data["metadata_"] = update_data.pop("metadata")
 
-        await self.db.commit()
-        await self.db.refresh(building)
+        # Empty payload or every value already stored - skip the UPDATE
+        if all(getattr(building, field) == value for field, value in update_data.items()):
+            return building
 
-        return building
+        return await self._update_returning(Building, building.id, update_data)
 
     async def delete_building(
         self,
@@ -203,18 +260,18 @@ class BuildingService:
         building_id: UUID,
     ) -> bool:
         """Delete a building (cascades to views, stacks, units)."""
-        building = await self.get_building(project_slug, building_id)
-        if not building:
+        project = await self.get_project_by_slug(project_slug)
+        if not project:
             return False
 
-        project = await self.get_project_by_slug(project_slug)
         if not await self.has_draft_version(project.id):
             return False
 
-        await self.db.delete(building)
-        await self.db.commit()
-
-        return True
+        return await self._delete_returning(
+            Building,
+            Building.id == building_id,
+            Building.project_id == project.id,
+        )
 
     # ============================================
     # BUILDING VIEW CRUD
@@ -267,13 +324,12 @@ class BuildingService:
         if not building:
             return None
 
-        result = await self.db.execute(
+        return await self.db.scalar(
             select(BuildingView).where(
                 BuildingView.id == view_id,
                 BuildingView.building_id == building_id
             )
         )
-        return result.scalar_one_or_none()
 
     async def get_view_by_ref(
         self,
@@ -281,13 +337,12 @@ class BuildingService:
         ref: str,
     ) -> Optional[BuildingView]:
         """Get view by building and ref."""
-        result = await self.db.execute(
+        return await self.db.scalar(
             select(BuildingView).where(
                 BuildingView.building_id == building_id,
                 BuildingView.ref == ref
             )
         )
-        return result.scalar_one_or_none()
 
     async def create_view(
         self,
@@ -350,16 +405,14 @@ class BuildingService:
                 return None
 
         update_data = data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            if field == "view_type" and value is not None:
-                setattr(view, field, value.value)
-            else:
-                setattr(view, field, value)
+        if update_data.get("view_type") is not None:
+            update_data["view_type"] = update_data["view_type"].value
 
-        await self.db.commit()
-        await self.db.refresh(view)
+        # Empty payload or every value already stored - skip the UPDATE
+        if all(getattr(view, field) == value for field, value in update_data.items()):
+            return view
 
-        return view
+        return await self._update_returning(BuildingView, view.id, update_data)
 
     async def delete_view(
         self,
@@ -368,18 +421,19 @@ class BuildingService:
         view_id: UUID,
     ) -> bool:
         """Delete a view."""
-        view = await self.get_view(project_slug, building_id, view_id)
-        if not view:
+        project = await self.get_project_by_slug(project_slug)
+        if not project:
             return False
 
-        project = await self.get_project_by_slug(project_slug)
         if not await self.has_draft_version(project.id):
             return False
 
-        await self.db.delete(view)
-        await self.db.commit()
-
-        return True
+        return await self._delete_returning(
+            BuildingView,
+            BuildingView.id == view_id,
+            BuildingView.building_id == building_id,
+            BuildingView.building_id.in_(self._project_building_ids(project.id)),
+        )
 
     # ============================================
     # STACK CRUD
@@ -422,13 +476,12 @@ class BuildingService:
         if not building:
             return None
 
-        result = await self.db.execute(
+        return await self.db.scalar(
             select(BuildingStack).where(
                 BuildingStack.id == stack_id,
                 BuildingStack.building_id == building_id
             )
         )
-        return result.scalar_one_or_none()
 
     async def get_stack_by_ref(
         self,
@@ -436,13 +489,12 @@ class BuildingService:
         ref: str,
     ) -> Optional[BuildingStack]:
         """Get stack by building and ref."""
-        result = await self.db.execute(
+        return await self.db.scalar(
             select(BuildingStack).where(
                 BuildingStack.building_id == building_id,
                 BuildingStack.ref == ref
             )
         )
-        return result.scalar_one_or_none()
 
     async def create_stack(
         self,
@@ -489,52 +541,64 @@ class BuildingService:
         stacks: List[BulkStackItem],
     ) -> Optional[Tuple[int, int, List[Dict[str, Any]]]]:
         """Bulk upsert stacks."""
-        building = await self.get_building(project_slug, building_id)
+        building = await self._resolve_draft_building(project_slug, building_id)
         if not building:
             return None
 
-        project = await self.get_project_by_slug(project_slug)
-        if not await self.has_draft_version(project.id):
-            return None
+        return await self._bulk_upsert_stacks_inner(building, stacks)
 
+    async def _bulk_upsert_stacks_inner(
+        self,
+        building: Building,
+        stacks: List[BulkStackItem],
+    ) -> Tuple[int, int, List[Dict[str, Any]]]:
+        """Bulk upsert stacks for an already-resolved building."""
+        building_id = building.id
         created = 0
         updated = 0
         errors = []
-
-        for idx, item in enumerate(stacks):
-            try:
-                existing = await self.get_stack_by_ref(building_id, item.ref)
-
-                if existing:
-                    existing.label = item.label
-                    existing.floor_start = item.floor_start
-                    existing.floor_end = item.floor_end
-                    existing.unit_type = item.unit_type
-                    existing.facing = item.facing
-                    existing.metadata_ = item.metadata or {}
-                    existing.sort_order = item.sort_order
-                    updated += 1
-                else:
-                    stack = BuildingStack(
-                        building_id=building_id,
-                        ref=item.ref,
-                        label=item.label,
-                        floor_start=item.floor_start,
-                        floor_end=item.floor_end,
-                        unit_type=item.unit_type,
-                        facing=item.facing,
-                        metadata_=item.metadata or {},
-                        sort_order=item.sort_order,
+        # Stacks added in this batch; autoflush is off so lookups won't see them
+        pending: Dict[str, BuildingStack] = {}
+
+        # Suppress autoflush so each ref lookup doesn't flush partial state
+        with self.db.no_autoflush:
+            for idx, item in enumerate(stacks):
+                try:
+                    existing = pending.get(item.ref) or await self.get_stack_by_ref(
+                        building_id, item.ref
                     )
-                    self.db.add(stack)
-                    created += 1
 
-            except Exception as e:
-                errors.append({
-                    "index": idx,
-                    "ref": item.ref,
-                    "error": str(e)
-                })
+                    if existing:
+                        existing.label = item.label
+                        existing.floor_start = item.floor_start
+                        existing.floor_end = item.floor_end
+                        existing.unit_type = item.unit_type
+                        existing.facing = item.facing
+                        existing.metadata_ = item.metadata or {}
+                        existing.sort_order = item.sort_order
+                        updated += 1
+                    else:
+                        stack = BuildingStack(
+                            building_id=building_id,
+                            ref=item.ref,
+                            label=item.label,
+                            floor_start=item.floor_start,
+                            floor_end=item.floor_end,
+                            unit_type=item.unit_type,
+                            facing=item.facing,
+                            metadata_=item.metadata or {},
+                            sort_order=item.sort_order,
+                        )
+                        self.db.add(stack)
+                        pending[item.ref] = stack
+                        created += 1
+
+                except Exception as e:
+                    errors.append({
+                        "index": idx,
+                        "ref": item.ref,
+                        "error": str(e)
+                    })
 
         await self.db.commit()
 
@@ -547,18 +611,19 @@ class BuildingService:
         stack_id: UUID,
     ) -> bool:
         """Delete a stack."""
-        stack = await self.get_stack(project_slug, building_id, stack_id)
-        if not stack:
+        project = await self.get_project_by_slug(project_slug)
+        if not project:
             return False
 
-        project = await self.get_project_by_slug(project_slug)
         if not await self.has_draft_version(project.id):
             return False
 
-        await self.db.delete(stack)
-        await self.db.commit()
-
-        return True
+        return await self._delete_returning(
+            BuildingStack,
+            BuildingStack.id == stack_id,
+            BuildingStack.building_id == building_id,
+            BuildingStack.building_id.in_(self._project_building_ids(project.id)),
+        )
 
     # ============================================
     # BUILDING UNIT CRUD
@@ -612,13 +677,12 @@ class BuildingService:
         if not building:
             return None
 
-        result = await self.db.execute(
+        return await self.db.scalar(
             select(BuildingUnit).where(
                 BuildingUnit.id == unit_id,
                 BuildingUnit.building_id == building_id
             )
         )
-        return result.scalar_one_or_none()
 
     async def get_unit_by_ref(
         self,
@@ -626,13 +690,12 @@ class BuildingService:
         ref: str,
     ) -> Optional[BuildingUnit]:
         """Get unit by building and ref."""
-        result = await self.db.execute(
+        return await self.db.scalar(
             select(BuildingUnit).where(
                 BuildingUnit.building_id == building_id,
                 BuildingUnit.ref == ref
             )
         )
-        return result.scalar_one_or_none()
 
     async def create_unit(
         self,
@@ -697,16 +760,14 @@ class BuildingService:
                 return None
 
         update_data = data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            if field == "status" and value is not None:
-                setattr(unit, field, value.value)
-            else:
-                setattr(unit, field, value)
+        if update_data.get("status") is not None:
+            update_data["status"] = update_data["status"].value
 
-        await self.db.commit()
-        await self.db.refresh(unit)
+        # Empty payload or every value already stored - skip the UPDATE
+        if all(getattr(unit, field) == value for field, value in update_data.items()):
+            return unit
 
-        return unit
+        return await self._update_returning(BuildingUnit, unit.id, update_data)
 
     async def generate_units_from_stacks(
         self,
@@ -723,14 +784,10 @@ class BuildingService:
 
         Returns (created, skipped) counts.
         """
-        building = await self.get_building(project_slug, building_id)
+        building = await self._resolve_draft_building(project_slug, building_id)
         if not building:
             return None
 
-        project = await self.get_project_by_slug(project_slug)
-        if not await self.has_draft_version(project.id):
-            return None
-
         # Get stacks to process
         query = select(BuildingStack).where(
             BuildingStack.building_id == building_id
@@ -749,36 +806,38 @@ class BuildingService:
         created = 0
         skipped = 0
 
-        for stack in stacks:
-            for floor in range(stack.floor_start, stack.floor_end + 1):
-                if floor in all_skip_floors:
-                    skipped += 1
-                    continue
+        # Suppress autoflush so each ref lookup doesn't flush pending units
+        with self.db.no_autoflush:
+            for stack in stacks:
+                for floor in range(stack.floor_start, stack.floor_end + 1):
+                    if floor in all_skip_floors:
+                        skipped += 1
+                        continue
 
-                # Generate unit ref: BUILDING-FLOOR-STACK
-                # e.g., "A-15-01" for Tower A, Floor 15, Stack 01
-                building_prefix = building.ref.replace("tower-", "").replace("building-", "").upper()
-                unit_ref = f"{building_prefix}-{floor:02d}-{stack.ref}"
+                    # Generate unit ref: BUILDING-FLOOR-STACK
+                    # e.g., "A-15-01" for Tower A, Floor 15, Stack 01
+                    building_prefix = building.ref.replace("tower-", "").replace("building-", "").upper()
+                    unit_ref = f"{building_prefix}-{floor:02d}-{stack.ref}"
 
-                # Check if already exists
-                existing = await self.get_unit_by_ref(building_id, unit_ref)
-                if existing:
-                    skipped += 1
-                    continue
+                    # Check if already exists
+                    existing = await self.get_unit_by_ref(building_id, unit_ref)
+                    if existing:
+                        skipped += 1
+                        continue
 
-                unit = BuildingUnit(
-                    building_id=building_id,
-                    stack_id=stack.id,
-                    ref=unit_ref,
-                    floor_number=floor,
-                    unit_number=stack.ref,
-                    unit_type=stack.unit_type,
-                    status="available",
-                    props={},
-                )
+                    unit = BuildingUnit(
+                        building_id=building_id,
+                        stack_id=stack.id,
+                        ref=unit_ref,
+                        floor_number=floor,
+                        unit_number=stack.ref,
+                        unit_type=stack.unit_type,
+                        status="available",
+                        props={},
+                    )
 
-                self.db.add(unit)
-                created += 1
+                    self.db.add(unit)
+                    created += 1
 
         await self.db.commit()
 
@@ -791,18 +850,19 @@ class BuildingService:
         unit_id: UUID,
     ) -> bool:
         """Delete a unit."""
-        unit = await self.get_unit(project_slug, building_id, unit_id)
-        if not unit:
+        project = await self.get_project_by_slug(project_slug)
+        if not project:
             return False
 
-        project = await self.get_project_by_slug(project_slug)
         if not await self.has_draft_version(project.id):
             return False
 
-        await self.db.delete(unit)
-        await self.db.commit()
-
-        return True
+        return await self._delete_returning(
+            BuildingUnit,
+            BuildingUnit.id == unit_id,
+            BuildingUnit.building_id == building_id,
+            BuildingUnit.building_id.in_(self._project_building_ids(project.id)),
+        )
 
     # ============================================
     # VIEW OVERLAY MAPPING CRUD
@@ -879,17 +939,65 @@ class BuildingService:
 
         Resolves target_ref to stack_id or unit_id based on target_type.
         """
-        view = await self.get_view(project_slug, building_id, view_id)
-        if not view:
+        building = await self._resolve_draft_building(project_slug, building_id)
+        if not building:
             return None
 
-        project = await self.get_project_by_slug(project_slug)
-        if not await self.has_draft_version(project.id):
+        view_result = await self.db.execute(
+            select(BuildingView.id).where(
+                BuildingView.id == view_id,
+                BuildingView.building_id == building.id
+            )
+        )
+        if view_result.first() is None:
             return None
 
+        return await self._bulk_upsert_overlay_mappings_inner(
+            building, view_id, mappings
+        )
+
+    async def _bulk_upsert_overlay_mappings_inner(
+        self,
+        building: Building,
+        view_id: UUID,
+        mappings: List[BulkOverlayMappingItem],
+    ) -> Tuple[int, int, List[Dict[str, Any]]]:
+        """Bulk upsert overlay mappings for an already-resolved building and view."""
+        building_id = building.id
         created = 0
         updated = 0
         errors = []
+        # New mapping rows keyed by (target_type, target id), inserted in one batch
+        new_rows: Dict[Tuple[str, UUID], Dict[str, Any]] = {}
+
+        # Prefetch targets and the view's existing mappings in three queries
+        stacks_by_ref = await batch_fetch_stacks_by_ref(
+            self.db,
+            building_id,
+            (item.target_ref for item in mappings if item.target_type == "stack"),
+        )
+        units_by_ref = await batch_fetch_units_by_ref(
+            self.db,
+            building_id,
+            (item.target_ref for item in mappings if item.target_type != "stack"),
+        )
+        # Existing mappings as bare (id, target) rows - no ORM hydration
+        existing_result = await self.db.stream(
+            select(
+                ViewOverlayMapping.id,
+                ViewOverlayMapping.target_type,
+                ViewOverlayMapping.stack_id,
+                ViewOverlayMapping.unit_id,
+            )
+            .where(ViewOverlayMapping.view_id == view_id)
+            .execution_options(yield_per=1000)
+        )
+        existing_by_target = {
+            (row.target_type, row.stack_id or row.unit_id): row.id
+            async for row in existing_result
+        }
+        # Updates to existing mappings keyed by mapping ID, applied in one batch
+        updated_rows: Dict[UUID, Dict[str, Any]] = {}
 
         for idx, item in enumerate(mappings):
             try:
@@ -898,7 +1006,7 @@ class BuildingService:
                 unit_id = None
 
                 if item.target_type == "stack":
-                    stack = await self.get_stack_by_ref(building_id, item.target_ref)
+                    stack = stacks_by_ref.get(item.target_ref)
                     if not stack:
                         errors.append({
                             "index": idx,
@@ -908,7 +1016,7 @@ class BuildingService:
                         continue
                     stack_id = stack.id
                 else:  # unit
-                    unit = await self.get_unit_by_ref(building_id, item.target_ref)
+                    unit = units_by_ref.get(item.target_ref)
                     if not unit:
                         errors.append({
                             "index": idx,
@@ -918,39 +1026,37 @@ class BuildingService:
                         continue
                     unit_id = unit.id
 
-                # Check for existing mapping
-                existing_query = select(ViewOverlayMapping).where(
-                    ViewOverlayMapping.view_id == view_id,
-                    ViewOverlayMapping.target_type == item.target_type
-                )
-                if stack_id:
-                    existing_query = existing_query.where(
-                        ViewOverlayMapping.stack_id == stack_id
-                    )
-                if unit_id:
-                    existing_query = existing_query.where(
-                        ViewOverlayMapping.unit_id == unit_id
-                    )
-
-                existing_result = await self.db.execute(existing_query)
-                existing = existing_result.scalar_one_or_none()
+                # Repeated target earlier in this payload - update the pending row
+                key = (item.target_type, stack_id or unit_id)
+                pending = new_rows.get(key)
+                if pending:
+                    pending["geometry"] = item.geometry
+                    pending["label_position"] = item.label_position
+                    pending["sort_order"] = item.sort_order
+                    updated += 1
+                    continue
 
-                if existing:
-                    existing.geometry = item.geometry
-                    existing.label_position = item.label_position
-                    existing.sort_order = item.sort_order
+                # Check for existing mapping
+                existing_id = existing_by_target.get(key)
+
+                if existing_id:
+                    updated_rows[existing_id] = {
+                        "id": existing_id,
+                        "geometry": item.geometry,
+                        "label_position": item.label_position,
+                        "sort_order": item.sort_order,
+                    }
                     updated += 1
                 else:
-                    mapping = ViewOverlayMapping(
-                        view_id=view_id,
-                        target_type=item.target_type,
-                        stack_id=stack_id,
-                        unit_id=unit_id,
-                        geometry=item.geometry,
-                        label_position=item.label_position,
-                        sort_order=item.sort_order,
-                    )
-                    self.db.add(mapping)
+                    new_rows[key] = {
+                        "view_id": view_id,
+                        "target_type": item.target_type,
+                        "stack_id": stack_id,
+                        "unit_id": unit_id,
+                        "geometry": item.geometry,
+                        "label_position": item.label_position,
+                        "sort_order": item.sort_order,
+                    }
                     created += 1
 
             except Exception as e:
@@ -960,6 +1066,14 @@ class BuildingService:
                     "error": str(e)
                 })
 
+        if updated_rows:
+            # Bulk UPDATE by primary key instead of flushing loaded instances
+            await self.db.execute(update(ViewOverlayMapping), list(updated_rows.values()))
+
+        if new_rows:
+            # Single executemany INSERT instead of one INSERT per mapping
+            await self.db.execute(insert(ViewOverlayMapping), list(new_rows.values()))
+
         await self.db.commit()
 
         return created, updated, errors
@@ -980,15 +1094,9 @@ class BuildingService:
         if not await self.has_draft_version(project.id):
             return False
 
-        result = await self.db.execute(
-            select(ViewOverlayMapping).where(
-                ViewOverlayMapping.id == mapping_id,
-                ViewOverlayMapping.view_id == view_id
-            )
-        )
-        mapping = result.scalar_one_or_none()
-
-        if not mapping:
+        # Primary-key lookup (identity map first), then check the owning view
+        mapping = await self.db.get(ViewOverlayMapping, mapping_id)
+        if not mapping or mapping.view_id != view_id:
             return False
 
         await self.db.delete(mapping)
@@ -5,10 +5,13 @@ Handles project configuration management.
 
 Config belongs to projects (not versions) - versions are just release tags.
 """
-from typing import Any, Dict, Optional
+import copy
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, exists, func, literal, select, update
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.config import ProjectConfig
@@ -22,6 +25,63 @@ from app.schemas.config import (
     ProjectConfigUpdate,
 )
 
+# Default popup/filter config - templates, never handed out directly
+_DEFAULT_POPUP_CONFIG = {
+    "enabled": True,
+    "showPrice": True,
+    "showArea": True,
+    "showStatus": True,
+    "fields": []
+}
+
+_DEFAULT_FILTER_CONFIG = {
+    "enableStatusFilter": True,
+    "enableTypeFilter": False,
+    "enableLayerFilter": False,
+    "defaultStatuses": ["available", "reserved", "sold", "unreleased"]
+}
+
+_DEFAULT_CONFIG_VALUES = {
+    "theme": DEFAULT_THEME,
+    "map_settings": DEFAULT_MAP_SETTINGS,
+    "status_colors": DEFAULT_STATUS_COLORS,
+    "popup_config": _DEFAULT_POPUP_CONFIG,
+    "filter_config": _DEFAULT_FILTER_CONFIG,
+}
+
+
+# Prebuilt statements - executed with {"slug": ...}
+_CONFIG_WITH_PROJECT_BY_SLUG = (
+    select(Project, ProjectConfig)
+    .outerjoin(ProjectConfig, ProjectConfig.project_id == Project.id)
+    .where(
+        Project.slug == bindparam("slug"),
+        Project.is_active == True
+    )
+)
+
+_CONFIG_FOR_WRITE_BY_SLUG = _CONFIG_WITH_PROJECT_BY_SLUG.add_columns(
+    exists().where(
+        ProjectVersion.project_id == Project.id,
+        ProjectVersion.status == "draft"
+    ).label("has_draft")
+)
+
+_CONFIG_BY_PROJECT_ID = select(ProjectConfig).where(
+    ProjectConfig.project_id == bindparam("project_id")
+)
+
+
+# Rendered get_config_with_defaults output keyed by (config.id, updated_at);
+# updated_at changes on every write, so entries never go stale
+_RENDERED_CACHE_SIZE = 256
+_rendered_configs: Dict[Tuple[UUID, Optional[datetime]], Dict[str, Any]] = {}
+
+
+def _fresh_defaults() -> Dict[str, Any]:
+    """Per-column default values as fresh, independently mutable copies."""
+    return copy.deepcopy(_DEFAULT_CONFIG_VALUES)
+
 
 class ConfigService:
     """Service for managing project configurations."""
@@ -29,36 +89,76 @@ class ConfigService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def get_project_by_slug(self, project_slug: str) -> Optional[Project]:
-        """Get project by slug."""
+    async def _load_config_with_project(
+        self,
+        project_slug: str,
+    ) -> Tuple[Optional[Project], Optional[ProjectConfig]]:
+        """
+        Load a project and its config in a single round trip.
+
+        Returns (None, None) if the project is not found and
+        (project, None) if the project has no config yet.
+        """
         result = await self.db.execute(
-            select(Project).where(
-                Project.slug == project_slug,
-                Project.is_active == True
-            )
+            _CONFIG_WITH_PROJECT_BY_SLUG, {"slug": project_slug}
         )
-        return result.scalar_one_or_none()
+        row = result.first()
+        if row is None:
+            return None, None
+        return row[0], row[1]
 
-    async def has_draft_version(self, project_id: UUID) -> bool:
-        """Check if project has a draft version (allows modifications)."""
+    async def _load_config_for_write(
+        self,
+        project_slug: str,
+    ) -> Tuple[Optional[Project], Optional[ProjectConfig], bool]:
+        """
+        Load a project, its config and its draft flag in a single round trip.
+
+        The third element is True if the project has a draft version
+        (modifications allowed).
+        """
         result = await self.db.execute(
-            select(ProjectVersion).where(
-                ProjectVersion.project_id == project_id,
-                ProjectVersion.status == "draft"
-            )
+            _CONFIG_FOR_WRITE_BY_SLUG, {"slug": project_slug}
         )
-        return result.scalar_one_or_none() is not None
+        row = result.first()
+        if row is None:
+            return None, None, False
+        return row[0], row[1], bool(row[2])
+
+    def _new_default_config(self, project_id: UUID) -> ProjectConfig:
+        """Build a config populated with defaults and add it to the session."""
+        config = ProjectConfig(project_id=project_id, **_fresh_defaults())
+        self.db.add(config)
+        return config
 
-    async def get_config(self, project_slug: str) -> Optional[ProjectConfig]:
-        """Get config for a project."""
-        project = await self.get_project_by_slug(project_slug)
-        if not project:
-            return None
+    async def _insert_default_config(self, project_id: UUID) -> ProjectConfig:
+        """
+        Insert a default config with ON CONFLICT DO NOTHING and commit.
 
-        config_result = await self.db.execute(
-            select(ProjectConfig).where(ProjectConfig.project_id == project.id)
+        If a concurrent request created the row first, the existing
+        config is selected instead.
+        """
+        result = await self.db.execute(
+            pg_insert(ProjectConfig)
+            .values(project_id=project_id, **_fresh_defaults())
+            .on_conflict_do_nothing(index_elements=["project_id"])
+            .returning(ProjectConfig)
         )
-        return config_result.scalar_one_or_none()
+        config = result.scalar_one_or_none()
+
+        if config is None:
+            config_result = await self.db.execute(
+                _CONFIG_BY_PROJECT_ID, {"project_id": project_id}
+            )
+            config = config_result.scalar_one()
+
+        await self.db.commit()
+        return config
+
+    async def get_config(self, project_slug: str) -> Optional[ProjectConfig]:
+        """Get config for a project."""
+        _, config = await self._load_config_with_project(project_slug)
+        return config
 
     async def get_or_create_config(self, project_slug: str) -> Optional[ProjectConfig]:
         """
@@ -66,45 +166,15 @@ class ConfigService:
 
         Returns None if project not found.
         """
-        project = await self.get_project_by_slug(project_slug)
+        project, config = await self._load_config_with_project(project_slug)
         if not project:
             return None
 
-        # Check if config exists
-        config_result = await self.db.execute(
-            select(ProjectConfig).where(ProjectConfig.project_id == project.id)
-        )
-        config = config_result.scalar_one_or_none()
-
         if config:
             return config
 
         # Create default config
-        config = ProjectConfig(
-            project_id=project.id,
-            theme=DEFAULT_THEME.copy(),
-            map_settings=DEFAULT_MAP_SETTINGS.copy(),
-            status_colors=DEFAULT_STATUS_COLORS.copy(),
-            popup_config={
-                "enabled": True,
-                "showPrice": True,
-                "showArea": True,
-                "showStatus": True,
-                "fields": []
-            },
-            filter_config={
-                "enableStatusFilter": True,
-                "enableTypeFilter": False,
-                "enableLayerFilter": False,
-                "defaultStatuses": ["available", "reserved", "sold", "unreleased"]
-            }
-        )
-
-        self.db.add(config)
-        await self.db.commit()
-        await self.db.refresh(config)
-
-        return config
+        return await self._insert_default_config(project.id)
 
     async def update_config(
         self,
@@ -116,34 +186,49 @@ class ConfigService:
 
         Returns None if project not found or no draft version exists.
         """
-        project = await self.get_project_by_slug(project_slug)
+        project, config, has_draft = await self._load_config_for_write(project_slug)
         if not project:
             return None
 
         # Only allow modifications if there's a draft version
-        if not await self.has_draft_version(project.id):
+        if not has_draft:
             return None
 
-        # Get or create config
-        config = await self.get_or_create_config(project_slug)
+        update_data = {
+            field: value
+            for field, value in data.model_dump(exclude_unset=True).items()
+            if value is not None
+        }
+
         if not config:
-            return None
+            # New config - merge the patch into the defaults before inserting
+            config = self._new_default_config(project.id)
+            for field, value in update_data.items():
+                setattr(config, field, {**getattr(config, field), **value})
+
+            await self.db.commit()
+
+            return config
 
-        # Update fields - merge JSONB fields
-        update_data = data.model_dump(exclude_unset=True)
+        if not update_data:
+            return config
 
-        for field, value in update_data.items():
-            if value is not None:
-                current_value = getattr(config, field)
-                if isinstance(current_value, dict) and isinstance(value, dict):
-                    # Merge dictionaries
-                    merged = {**current_value, **value}
-                    setattr(config, field, merged)
-                else:
-                    setattr(config, field, value)
+        # Merge JSONB fields server-side: column = COALESCE(column, '{}') || patch
+        result = await self.db.execute(
+            update(ProjectConfig)
+            .where(ProjectConfig.id == config.id)
+            .values({
+                getattr(ProjectConfig, field): func.coalesce(
+                    getattr(ProjectConfig, field), literal({}, JSONB)
+                ).op("||", return_type=JSONB)(literal(value, JSONB))
+                for field, value in update_data.items()
+            })
+            .returning(ProjectConfig)
+            .execution_options(populate_existing=True)
+        )
+        config = result.scalar_one()
 
         await self.db.commit()
-        await self.db.refresh(config)
 
         return config
 
@@ -153,44 +238,23 @@ class ConfigService:
 
         Returns None if project not found or no draft version exists.
         """
-        project = await self.get_project_by_slug(project_slug)
+        project, config, has_draft = await self._load_config_for_write(project_slug)
         if not project:
             return None
 
         # Only allow modifications if there's a draft version
-        if not await self.has_draft_version(project.id):
+        if not has_draft:
             return None
 
-        # Get config
-        config_result = await self.db.execute(
-            select(ProjectConfig).where(ProjectConfig.project_id == project.id)
-        )
-        config = config_result.scalar_one_or_none()
-
         if not config:
             # Create with defaults
-            return await self.get_or_create_config(project_slug)
+            return await self._insert_default_config(project.id)
 
         # Reset to defaults
-        config.theme = DEFAULT_THEME.copy()
-        config.map_settings = DEFAULT_MAP_SETTINGS.copy()
-        config.status_colors = DEFAULT_STATUS_COLORS.copy()
-        config.popup_config = {
-            "enabled": True,
-            "showPrice": True,
-            "showArea": True,
-            "showStatus": True,
-            "fields": []
-        }
-        config.filter_config = {
-            "enableStatusFilter": True,
-            "enableTypeFilter": False,
-            "enableLayerFilter": False,
-            "defaultStatuses": ["available", "reserved", "sold", "unreleased"]
-        }
+        for field, value in _fresh_defaults().items():
+            setattr(config, field, value)
 
         await self.db.commit()
-        await self.db.refresh(config)
 
         return config
 
@@ -199,13 +263,25 @@ class ConfigService:
         Get config with all defaults applied for missing fields.
 
         Returns a complete config object with no missing values.
+        The result is cached per config version and must not be mutated.
         """
-        # Merge with defaults
-        theme = {**DEFAULT_THEME, **(config.theme or {})}
-        map_settings = {**DEFAULT_MAP_SETTINGS, **(config.map_settings or {})}
-        status_colors = {**DEFAULT_STATUS_COLORS, **(config.status_colors or {})}
+        cache_key = (config.id, config.updated_at)
+        rendered = _rendered_configs.get(cache_key)
+        if rendered is not None:
+            return rendered
+
+        # Merge with defaults; empty values share the (read-only) defaults
+        theme = {**DEFAULT_THEME, **config.theme} if config.theme else DEFAULT_THEME
+        map_settings = (
+            {**DEFAULT_MAP_SETTINGS, **config.map_settings}
+            if config.map_settings else DEFAULT_MAP_SETTINGS
+        )
+        status_colors = (
+            {**DEFAULT_STATUS_COLORS, **config.status_colors}
+            if config.status_colors else DEFAULT_STATUS_COLORS
+        )
 
-        return {
+        rendered = {
             "id": str(config.id),
             "project_id": str(config.project_id),
             "theme": theme,
@@ -217,3 +293,10 @@ class ConfigService:
             "created_at": config.created_at,
             "updated_at": config.updated_at,
         }
+
+        if len(_rendered_configs) >= _RENDERED_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            _rendered_configs.pop(next(iter(_rendered_configs)))
+        _rendered_configs[cache_key] = rendered
+
+        return rendered
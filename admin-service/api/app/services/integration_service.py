@@ -3,15 +3,22 @@ Integration Service
 
 Handles client API integration configuration with encrypted credentials.
 """
+import base64
 import time
+from datetime import datetime
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
 import httpx
-from sqlalchemy import select
+import orjson
+from sqlalchemy import bindparam, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.lib.crypto import decrypt_credentials, encrypt_credentials, has_credentials
+from app.lib.crypto import decrypt_credentials, encrypt_credentials
+from app.lib.http_client import get_client
+from app.lib.project_cache import get_active_project_by_slug
 from app.models.integration import IntegrationConfig
 from app.models.project import Project
 from app.schemas.integration import (
@@ -20,21 +27,66 @@ from app.schemas.integration import (
 )
 
 
+# Prebuilt statement - executed with {"project_id": ...}
+_CONFIG_BY_PROJECT_ID = select(IntegrationConfig).where(
+    IntegrationConfig.project_id == bindparam("project_id")
+)
+
+
+# Seconds a successful test_connection result is reused, so repeated
+# "test connection" clicks collapse into one real request
+CONNECTION_TEST_CACHE_TTL = 5.0
+
+# (config.id, url, updated_at) -> (expires_at, result)
+_connection_tests: Dict[Tuple[UUID, str, Optional[datetime]], Tuple[float, Dict[str, Any]]] = {}
+
+
+@lru_cache(maxsize=256)
+def _cached_decrypt(
+    config_id: UUID,
+    updated_at: Optional[datetime],
+    encrypted_credentials: str,
+) -> Optional[Dict[str, Any]]:
+    """
+    Decrypt credentials once per config version.
+
+    Keyed by config ID, updated_at and the ciphertext, so any config update
+    misses the cache. The returned dict is shared - callers must not mutate it.
+    """
+    return decrypt_credentials(encrypted_credentials)
+
+
+def _auth_headers_for(auth_type: str, creds: Dict[str, Any]) -> Dict[str, str]:
+    """Build auth headers for an auth type from decrypted credentials."""
+    if auth_type == "bearer":
+        token = creds.get("token")
+        if token:
+            return {"Authorization": f"Bearer {token}"}
+
+    elif auth_type == "api_key":
+        api_key = creds.get("api_key")
+        header_name = creds.get("api_key_header", "X-API-Key")
+        if api_key:
+            return {header_name: api_key}
+
+    elif auth_type == "basic":
+        userpass = creds.get("username", "").encode() + b":" + creds.get("password", "").encode()
+        return {"Authorization": "Basic " + base64.b64encode(userpass).decode("ascii")}
+
+    return {}
+
+
 class IntegrationService:
     """Service for managing client API integrations."""
 
     def __init__(self, db: AsyncSession):
         self.db = db
+        # (status_mapping, inverse) for the last mapping passed to map_status
+        self._inverse_mapping: Optional[Tuple[Dict[str, List[str]], Dict[str, str]]] = None
 
     async def get_project_by_slug(self, slug: str) -> Optional[Project]:
         """Get project by slug."""
-        result = await self.db.execute(
-            select(Project).where(
-                Project.slug == slug,
-                Project.is_active == True
-            )
-        )
-        return result.scalar_one_or_none()
+        return await get_active_project_by_slug(self.db, slug)
 
     async def get_config(self, project_slug: str) -> Optional[IntegrationConfig]:
         """Get integration config for a project."""
@@ -42,12 +94,9 @@ class IntegrationService:
         if not project:
             return None
 
-        result = await self.db.execute(
-            select(IntegrationConfig).where(
-                IntegrationConfig.project_id == project.id
-            )
+        return await self.db.scalar(
+            _CONFIG_BY_PROJECT_ID, {"project_id": project.id}
         )
-        return result.scalar_one_or_none()
 
     async def get_or_create_config(self, project_slug: str) -> Optional[IntegrationConfig]:
         """Get or create integration config for a project."""
@@ -55,30 +104,37 @@ class IntegrationService:
         if not project:
             return None
 
-        result = await self.db.execute(
-            select(IntegrationConfig).where(
-                IntegrationConfig.project_id == project.id
-            )
+        config = await self.db.scalar(
+            _CONFIG_BY_PROJECT_ID, {"project_id": project.id}
         )
-        config = result.scalar_one_or_none()
 
         if config:
             return config
 
-        # Create default config
-        config = IntegrationConfig(
-            project_id=project.id,
-            auth_type="none",
-            status_mapping=DEFAULT_STATUS_MAPPING,
-            update_method="polling",
-            polling_interval_seconds=30,
-            timeout_seconds=10,
-            retry_count=3,
+        # Create default config; ON CONFLICT covers a concurrent create
+        result = await self.db.execute(
+            pg_insert(IntegrationConfig)
+            .values(
+                project_id=project.id,
+                auth_type="none",
+                status_mapping=DEFAULT_STATUS_MAPPING,
+                update_method="polling",
+                polling_interval_seconds=30,
+                timeout_seconds=10,
+                retry_count=3,
+            )
+            .on_conflict_do_nothing(index_elements=["project_id"])
+            .returning(IntegrationConfig)
         )
+        config = result.scalar_one_or_none()
+
+        if config is None:
+            result = await self.db.execute(
+                _CONFIG_BY_PROJECT_ID, {"project_id": project.id}
+            )
+            config = result.scalar_one()
 
-        self.db.add(config)
         await self.db.commit()
-        await self.db.refresh(config)
 
         return config
 
@@ -116,7 +172,6 @@ class IntegrationService:
                 setattr(config, field, value)
 
         await self.db.commit()
-        await self.db.refresh(config)
 
         return config
 
@@ -159,37 +214,47 @@ class IntegrationService:
         # Build full URL
         url = f"{base_url.rstrip('/')}{endpoint}"
 
+        # Reuse a very recent successful probe of the same config version
+        cache_key = (config.id, url, config.updated_at)
+        cached = _connection_tests.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
         # Build headers
         headers = await self._build_auth_headers(config)
 
         # Make request
         start_time = time.time()
         try:
-            async with httpx.AsyncClient(timeout=config.timeout_seconds) as client:
-                response = await client.get(url, headers=headers)
+            client = get_client()
+            response = await client.get(
+                url, headers=headers, timeout=config.timeout_seconds
+            )
 
             response_time_ms = int((time.time() - start_time) * 1000)
 
             if response.status_code == 200:
                 try:
-                    data = response.json()
+                    data = orjson.loads(response.content)
                     # Extract sample (first 5 items if list)
                     sample = data[:5] if isinstance(data, list) else [data]
                 except Exception:
                     sample = None
 
-                return {
+                result = {
                     "success": True,
                     "status_code": response.status_code,
                     "response_time_ms": response_time_ms,
                     "sample_data": sample,
                 }
+                self._cache_connection_test(cache_key, result)
+                return result
             else:
                 return {
                     "success": False,
                     "status_code": response.status_code,
                     "response_time_ms": response_time_ms,
-                    "error": f"HTTP {response.status_code}: {response.text[:200]}",
+                    "error": f"HTTP {response.status_code}: {response.content[:200].decode('utf-8', errors='replace')}",
                 }
 
         except httpx.TimeoutException:
@@ -199,36 +264,37 @@ class IntegrationService:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    def _cache_connection_test(
+        self,
+        cache_key: Tuple[UUID, str, Optional[datetime]],
+        result: Dict[str, Any],
+    ) -> None:
+        """Store a successful test result, pruning expired entries."""
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _) in _connection_tests.items() if expires_at <= now]:
+            del _connection_tests[key]
+
+        _connection_tests[cache_key] = (now + CONNECTION_TEST_CACHE_TTL, result)
+
     async def _build_auth_headers(self, config: IntegrationConfig) -> Dict[str, str]:
         """Build authentication headers based on config."""
-        headers = {}
-
         if config.auth_type == "none" or not config.auth_credentials:
-            return headers
+            return {}
 
-        creds = decrypt_credentials(config.auth_credentials)
+        creds = self._decrypt_config_credentials(config)
         if not creds:
-            return headers
-
-        if config.auth_type == "bearer":
-            token = creds.get("token")
-            if token:
-                headers["Authorization"] = f"Bearer {token}"
+            return {}
 
-        elif config.auth_type == "api_key":
-            api_key = creds.get("api_key")
-            header_name = creds.get("api_key_header", "X-API-Key")
-            if api_key:
-                headers[header_name] = api_key
+        return _auth_headers_for(config.auth_type, creds)
 
-        elif config.auth_type == "basic":
-            import base64
-            username = creds.get("username", "")
-            password = creds.get("password", "")
-            credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
-            headers["Authorization"] = f"Basic {credentials}"
-
-        return headers
+    def _decrypt_config_credentials(
+        self,
+        config: IntegrationConfig,
+    ) -> Optional[Dict[str, Any]]:
+        """Decrypt a config's credentials through the per-version cache."""
+        if not config.auth_credentials:
+            return None
+        return _cached_decrypt(config.id, config.updated_at, config.auth_credentials)
 
     def map_status(self, config: IntegrationConfig, client_status: str) -> Tuple[str, bool]:
         """
@@ -239,13 +305,31 @@ class IntegrationService:
         """
         mapping = config.status_mapping or DEFAULT_STATUS_MAPPING
 
-        for canonical, client_values in mapping.items():
-            if client_status in client_values:
-                return canonical, True
+        canonical = self._get_inverse_mapping(mapping).get(client_status)
+        if canonical is not None:
+            return canonical, True
 
         # Default to hidden if not found
         return "hidden", False
 
+    def _get_inverse_mapping(self, mapping: Dict[str, List[str]]) -> Dict[str, str]:
+        """
+        Get the client status -> canonical status lookup for a mapping.
+
+        Built once per mapping object; the first canonical status listing
+        a client value wins, as with a linear scan.
+        """
+        if self._inverse_mapping is not None and self._inverse_mapping[0] is mapping:
+            return self._inverse_mapping[1]
+
+        inverse: Dict[str, str] = {}
+        for canonical, client_values in mapping.items():
+            for client_value in client_values:
+                inverse.setdefault(client_value, canonical)
+
+        self._inverse_mapping = (mapping, inverse)
+        return inverse
+
     def config_has_credentials(self, config: IntegrationConfig) -> bool:
         """Check if config has valid credentials."""
-        return has_credentials(config.auth_credentials)
+        return self._decrypt_config_credentials(config) is not None
@@ -3,12 +3,15 @@ Job Service
 
 Manages background job lifecycle with SSE broadcasting.
 """
+import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import func, literal, select, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.lib.sse import SSEMessage, sse_manager
 from app.models.job import Job
@@ -55,7 +58,6 @@ class JobService:
 
         self.db.add(job)
         await self.db.commit()
-        await self.db.refresh(job)
 
         # Broadcast job created
         await self._broadcast_update(job)
@@ -102,7 +104,6 @@ class JobService:
 
         await self._add_log(job, "Job started", "info")
         await self.db.commit()
-        await self.db.refresh(job)
         await self._broadcast_update(job)
 
         return job
@@ -121,16 +122,23 @@ class JobService:
             progress: Progress 0-100
             message: Optional status message
         """
-        job = await self.get_job(job_id)
+        values: Dict[str, Any] = {"progress": min(100, max(0, progress))}
+        if message:
+            values["message"] = message
+
+        # Targeted UPDATE ... RETURNING instead of load + full-row flush
+        result = await self.db.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(values)
+            .returning(Job)
+            .execution_options(populate_existing=True)
+        )
+        job = result.scalar_one_or_none()
         if not job:
             return None
 
-        job.progress = min(100, max(0, progress))
-        if message:
-            job.message = message
-
         await self.db.commit()
-        await self.db.refresh(job)
         await self._broadcast_update(job)
 
         return job
@@ -148,7 +156,6 @@ class JobService:
 
         await self._add_log(job, message, level)
         await self.db.commit()
-        await self.db.refresh(job)
 
         return job
 
@@ -172,7 +179,6 @@ class JobService:
 
         await self._add_log(job, "Job completed successfully", "info")
         await self.db.commit()
-        await self.db.refresh(job)
         await self._broadcast_update(job, event="completed")
 
         return job
@@ -194,7 +200,6 @@ class JobService:
 
         await self._add_log(job, f"Job failed: {error}", "error")
         await self.db.commit()
-        await self.db.refresh(job)
         await self._broadcast_update(job, event="failed")
 
         return job
@@ -214,21 +219,36 @@ class JobService:
 
         await self._add_log(job, "Job cancelled by user", "warn")
         await self.db.commit()
-        await self.db.refresh(job)
         await self._broadcast_update(job, event="cancelled")
 
         return job
 
     async def _add_log(self, job: Job, message: str, level: str) -> None:
-        """Add log entry to job (internal)."""
+        """
+        Add log entry to job (internal).
+
+        Appends server-side with JSONB || so the existing log array is never
+        rewritten, then mirrors the entry onto the loaded instance.
+        """
+        # Epoch nanoseconds; formatted to ISO only when rendered
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "t": time.time_ns(),
             "level": level,
             "message": message,
         }
-        if job.logs is None:
-            job.logs = []
-        job.logs = job.logs + [log_entry]
+        await self.db.execute(
+            update(Job)
+            .where(Job.id == job.id)
+            .values(
+                logs=func.coalesce(Job.logs, literal([], JSONB))
+                .op("||", return_type=JSONB)(literal([log_entry], JSONB))
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        logs = job.logs if job.logs is not None else []
+        logs.append(log_entry)
+        set_committed_value(job, "logs", logs)
 
     async def _broadcast_update(
         self,
@@ -242,7 +262,14 @@ class JobService:
             event=event,
             id=str(job.progress),
         )
-        await sse_manager.broadcast(channel, message)
+
+        # Progress updates are coalesced; terminal events go out immediately
+        # and drop any progress still pending behind them
+        if event == "job_update":
+            await sse_manager.broadcast_coalesced(channel, message)
+        else:
+            sse_manager.drop_coalesced(channel)
+            await sse_manager.broadcast(channel, message)
 
     def get_channel(self, job_id: UUID) -> str:
         """Get SSE channel for a job."""
@@ -5,12 +5,16 @@ Handles overlay CRUD operations with bulk upsert support.
 
 Overlays belong to projects (not versions) - versions are just release tags.
 """
-from typing import List, Optional, Tuple
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import bindparam, delete, exists, func, literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.lib.project_cache import get_active_project_by_slug
 from app.models.overlay import Overlay
 from app.models.project import Project
 from app.models.version import ProjectVersion
@@ -22,6 +26,35 @@ from app.schemas.overlay import (
     OverlayUpdate,
 )
 
+# Active project by slug plus whether it has a draft version, in one query
+_PROJECT_FOR_WRITE_BY_SLUG = select(
+    Project,
+    exists().where(
+        ProjectVersion.project_id == Project.id,
+        ProjectVersion.status == "draft"
+    ).label("has_draft")
+).where(
+    Project.slug == bindparam("slug"),
+    Project.is_active == True
+)
+
+# Columns overwritten when a bulk upsert hits an existing (type, ref)
+_BULK_UPSERT_COLUMNS = (
+    "geometry",
+    "view_box",
+    "label",
+    "label_position",
+    "props",
+    "style_override",
+    "sort_order",
+    "is_visible",
+    "layer_id",
+    "source_level",
+)
+
+# Rows per INSERT statement (keeps bind parameters under the driver limit)
+_BULK_UPSERT_CHUNK_SIZE = 1000
+
 
 class OverlayService:
     """Service for managing overlays."""
@@ -30,24 +63,30 @@ class OverlayService:
         self.db = db
 
     async def get_project_by_slug(self, project_slug: str) -> Optional[Project]:
-        """Get project by slug."""
-        result = await self.db.execute(
-            select(Project).where(
-                Project.slug == project_slug,
-                Project.is_active == True
-            )
-        )
-        return result.scalar_one_or_none()
+        """Get project by slug (via the slug cache)."""
+        return await get_active_project_by_slug(self.db, project_slug)
 
     async def has_draft_version(self, project_id: UUID) -> bool:
         """Check if project has a draft version (allows modifications)."""
-        result = await self.db.execute(
-            select(ProjectVersion).where(
+        return await self.db.scalar(
+            select(exists().where(
                 ProjectVersion.project_id == project_id,
                 ProjectVersion.status == "draft"
-            ).limit(1)
+            ))
+        )
+
+    async def _load_project_for_write(
+        self,
+        project_slug: str,
+    ) -> Tuple[Optional[Project], bool]:
+        """Load the project and whether it has a draft version in one query."""
+        result = await self.db.execute(
+            _PROJECT_FOR_WRITE_BY_SLUG, {"slug": project_slug}
         )
-        return result.scalar_one_or_none() is not None
+        row = result.first()
+        if row is None:
+            return None, False
+        return row[0], bool(row[1])
 
     async def list_overlays(
         self,
@@ -65,28 +104,26 @@ class OverlayService:
         if not project:
             return None
 
-        # Build query
-        query = select(Overlay).where(Overlay.project_id == project.id)
-        count_query = select(func.count(Overlay.id)).where(Overlay.project_id == project.id)
+        # Total comes back with the rows via a window count
+        query = select(
+            Overlay,
+            func.count().over().label("total")
+        ).where(Overlay.project_id == project.id)
 
         if overlay_type:
             query = query.where(Overlay.overlay_type == overlay_type.value)
-            count_query = count_query.where(Overlay.overlay_type == overlay_type.value)
 
         if layer_id:
             query = query.where(Overlay.layer_id == layer_id)
-            count_query = count_query.where(Overlay.layer_id == layer_id)
-
-        # Get count
-        count_result = await self.db.execute(count_query)
-        total = count_result.scalar_one()
 
         # Get overlays ordered by sort_order then ref
         query = query.order_by(Overlay.sort_order, Overlay.ref)
-        overlays_result = await self.db.execute(query)
-        overlays = overlays_result.scalars().all()
+        rows = (await self.db.execute(query)).all()
+
+        overlays = [row[0] for row in rows]
+        total = rows[0].total if rows else 0
 
-        return list(overlays), total
+        return overlays, total
 
     async def get_overlay(
         self,
@@ -132,39 +169,39 @@ class OverlayService:
 
         Returns None if project not found or no draft version.
         """
-        project = await self.get_project_by_slug(project_slug)
+        project, has_draft = await self._load_project_for_write(project_slug)
         if not project:
             return None
 
         # Only allow modifications if there's a draft version
-        if not await self.has_draft_version(project.id):
+        if not has_draft:
             return None
 
-        # Check if ref already exists for this type
-        existing = await self.get_overlay_by_ref(
-            project.id, data.overlay_type.value, data.ref
+        # Insert unless the ref already exists for this type, in one statement
+        result = await self.db.execute(
+            pg_insert(Overlay)
+            .values(
+                project_id=project.id,
+                overlay_type=data.overlay_type.value,
+                ref=data.ref,
+                geometry=data.geometry,
+                view_box=data.view_box,
+                label=data.label,
+                label_position=data.label_position,
+                props=data.props or {},
+                style_override=data.style_override,
+                sort_order=data.sort_order or 0,
+                is_visible=data.is_visible if data.is_visible is not None else True,
+                layer_id=data.layer_id,
+            )
+            .on_conflict_do_nothing(constraint="uq_overlay_ref")
+            .returning(Overlay)
         )
-        if existing:
+        overlay = result.scalar_one_or_none()
+        if not overlay:
             return None  # Duplicate ref
 
-        overlay = Overlay(
-            project_id=project.id,
-            overlay_type=data.overlay_type.value,
-            ref=data.ref,
-            geometry=data.geometry,
-            view_box=data.view_box,
-            label=data.label,
-            label_position=data.label_position,
-            props=data.props or {},
-            style_override=data.style_override,
-            sort_order=data.sort_order or 0,
-            is_visible=data.is_visible if data.is_visible is not None else True,
-            layer_id=data.layer_id,
-        )
-
-        self.db.add(overlay)
         await self.db.commit()
-        await self.db.refresh(overlay)
 
         return overlay
 
@@ -179,16 +216,21 @@ class OverlayService:
 
         Returns None if not found or no draft version.
         """
-        project = await self.get_project_by_slug(project_slug)
+        project, has_draft = await self._load_project_for_write(project_slug)
         if not project:
             return None
 
         # Only allow modifications if there's a draft version
-        if not await self.has_draft_version(project.id):
+        if not has_draft:
             return None
 
         # Get overlay
-        overlay = await self.get_overlay(project_slug, overlay_id)
+        overlay = await self.db.scalar(
+            select(Overlay).where(
+                Overlay.id == overlay_id,
+                Overlay.project_id == project.id
+            )
+        )
         if not overlay:
             return None
 
@@ -225,12 +267,12 @@ class OverlayService:
 
         Returns True if deleted, False if not found or no draft version.
         """
-        project = await self.get_project_by_slug(project_slug)
+        project, has_draft = await self._load_project_for_write(project_slug)
         if not project:
             return False
 
         # Only allow modifications if there's a draft version
-        if not await self.has_draft_version(project.id):
+        if not has_draft:
             return False
 
         # Get overlay
@@ -261,59 +303,51 @@ class OverlayService:
         Matches by (project_id, overlay_type, ref).
         Returns None if project not found or no draft version.
         Returns tuple of (created_count, updated_count, errors).
+
+        If the same (type, ref) appears more than once, the last item wins
+        and each earlier copy counts as an update, as if the items had been
+        applied in order. Rows are upserted in chunks; if a chunk fails, its
+        rows are retried one by one so only the failing items are reported
+        and the rest are still saved.
         """
-        project = await self.get_project_by_slug(project_slug)
+        project, has_draft = await self._load_project_for_write(project_slug)
         if not project:
             return None
 
         # Only allow modifications if there's a draft version
-        if not await self.has_draft_version(project.id):
+        if not has_draft:
             return None
 
-        created = 0
-        updated = 0
         errors: List[BulkUpsertError] = []
 
+        # (request index, row) by (type, ref); last occurrence wins, as
+        # ON CONFLICT cannot touch the same row twice in one statement
+        rows: Dict[Tuple[str, str], Tuple[int, Dict[str, Any]]] = {}
+        # Earlier copies per (type, ref), counted as updates once saved
+        superseded: Dict[Tuple[str, str], int] = {}
+        now = datetime.utcnow()
         for idx, item in enumerate(overlays):
             try:
-                # Check if exists
-                existing = await self.get_overlay_by_ref(
-                    project.id, item.overlay_type.value, item.ref
-                )
-
-                if existing:
-                    # Update existing
-                    existing.geometry = item.geometry
-                    existing.view_box = item.view_box
-                    existing.label = item.label
-                    existing.label_position = item.label_position
-                    existing.props = item.props or {}
-                    existing.style_override = item.style_override
-                    existing.sort_order = item.sort_order or 0
-                    existing.is_visible = item.is_visible if item.is_visible is not None else True
-                    existing.layer_id = item.layer_id
-                    existing.source_level = item.source_level
-                    updated += 1
-                else:
-                    # Create new
-                    overlay = Overlay(
-                        project_id=project.id,
-                        overlay_type=item.overlay_type.value,
-                        ref=item.ref,
-                        geometry=item.geometry,
-                        view_box=item.view_box,
-                        label=item.label,
-                        label_position=item.label_position,
-                        props=item.props or {},
-                        style_override=item.style_override,
-                        sort_order=item.sort_order or 0,
-                        is_visible=item.is_visible if item.is_visible is not None else True,
-                        layer_id=item.layer_id,
-                        source_level=item.source_level,
-                    )
-                    self.db.add(overlay)
-                    created += 1
-
+                key = (item.overlay_type.value, item.ref)
+                if key in rows:
+                    superseded[key] = superseded.get(key, 0) + 1
+                rows[key] = (idx, {
+                    "project_id": project.id,
+                    "overlay_type": item.overlay_type.value,
+                    "ref": item.ref,
+                    "geometry": item.geometry,
+                    "view_box": item.view_box,
+                    "label": item.label,
+                    "label_position": item.label_position,
+                    "props": item.props or {},
+                    "style_override": item.style_override,
+                    "sort_order": item.sort_order or 0,
+                    "is_visible": item.is_visible if item.is_visible is not None else True,
+                    "layer_id": item.layer_id,
+                    "source_level": item.source_level,
+                    "created_at": now,
+                    "updated_at": now,
+                })
             except Exception as e:
                 errors.append(BulkUpsertError(
                     index=idx,
@@ -321,10 +355,73 @@ class OverlayService:
                     error=str(e)
                 ))
 
+        created = 0
+        updated = 0
+        indexed_rows = list(rows.values())
+
+        for start in range(0, len(indexed_rows), _BULK_UPSERT_CHUNK_SIZE):
+            chunk = indexed_rows[start:start + _BULK_UPSERT_CHUNK_SIZE]
+            try:
+                chunk_created, chunk_updated = await self._upsert_rows(
+                    [row for _, row in chunk]
+                )
+                chunk_updated += sum(
+                    superseded.get((row["overlay_type"], row["ref"]), 0)
+                    for _, row in chunk
+                )
+            except DBAPIError:
+                # Isolate the failing rows instead of dropping the whole chunk
+                chunk_created = chunk_updated = 0
+                for idx, row in chunk:
+                    try:
+                        row_created, row_updated = await self._upsert_rows([row])
+                    except DBAPIError as e:
+                        errors.append(BulkUpsertError(
+                            index=idx,
+                            ref=row["ref"],
+                            error=str(e.orig or e)
+                        ))
+                        continue
+                    chunk_created += row_created
+                    chunk_updated += row_updated + superseded.get(
+                        (row["overlay_type"], row["ref"]), 0
+                    )
+
+            created += chunk_created
+            updated += chunk_updated
+
         await self.db.commit()
 
+        errors.sort(key=lambda error: error.index)
         return created, updated, errors
 
+    async def _upsert_rows(self, rows: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        Upsert overlay rows in one statement inside a savepoint.
+
+        A failure rolls back only this statement and is re-raised.
+        Returns (created_count, updated_count).
+        """
+        stmt = pg_insert(Overlay).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_overlay_ref",
+            set_={
+                **{c: stmt.excluded[c] for c in _BULK_UPSERT_COLUMNS},
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ).returning(literal_column("xmax = 0").label("inserted"))
+
+        created = 0
+        updated = 0
+        async with self.db.begin_nested():
+            result = await self.db.execute(stmt)
+            for inserted in result.scalars():
+                if inserted:
+                    created += 1
+                else:
+                    updated += 1
+        return created, updated
+
     async def delete_by_type(
         self,
         project_slug: str,
@@ -336,27 +433,21 @@ class OverlayService:
         Returns None if project not found or no draft version.
         Returns count of deleted overlays.
         """
-        project = await self.get_project_by_slug(project_slug)
+        project, has_draft = await self._load_project_for_write(project_slug)
         if not project:
             return None
 
         # Only allow modifications if there's a draft version
-        if not await self.has_draft_version(project.id):
+        if not has_draft:
             return None
 
-        # Get all overlays of this type
-        overlays_result = await self.db.execute(
-            select(Overlay).where(
+        # Delete all overlays of this type in one statement
+        result = await self.db.execute(
+            delete(Overlay).where(
                 Overlay.project_id == project.id,
                 Overlay.overlay_type == overlay_type.value
             )
         )
-        overlays = overlays_result.scalars().all()
-
-        count = len(overlays)
-        for overlay in overlays:
-            await self.db.delete(overlay)
-
         await self.db.commit()
 
-        return count
+        return result.rowcount
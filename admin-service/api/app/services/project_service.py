@@ -1,10 +1,12 @@
 from typing import List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import exists, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.lib.project_cache import get_active_project_by_slug, invalidate_project_slug
 from app.models.project import Project
 from app.models.version import ProjectVersion
 from app.models.config import ProjectConfig
@@ -46,6 +48,10 @@ class ProjectService:
         )
         return result.scalar_one_or_none()
 
+    async def get_project_by_slug_light(self, slug: str) -> Optional[Project]:
+        """Get project by slug without loading versions (via the slug cache)."""
+        return await get_active_project_by_slug(self.db, slug)
+
     async def get_project_by_id(self, project_id: UUID) -> Optional[Project]:
         """Get project by ID."""
         result = await self.db.execute(
@@ -57,39 +63,22 @@ class ProjectService:
 
     async def slug_exists(self, slug: str) -> bool:
         """Check if slug already exists."""
-        result = await self.db.execute(
-            select(func.count(Project.id)).where(Project.slug == slug)
-        )
-        return result.scalar_one() > 0
+        return bool(await self.db.scalar(
+            select(exists().where(Project.slug == slug))
+        ))
 
     async def create_project(
         self, data: ProjectCreate, user_id: UUID
     ) -> Project:
         """Create project with initial draft version."""
-        # Create project
-        project = Project(
-            slug=data.slug,
-            name=data.name,
-            name_ar=data.name_ar,
-            description=data.description,
-            created_by=user_id,
-            is_active=True,
-        )
-        self.db.add(project)
-        await self.db.flush()
-
-        # Create initial version (v1 draft)
+        # Initial version (v1 draft)
         version = ProjectVersion(
-            project_id=project.id,
             version_number=1,
             status="draft",
         )
-        self.db.add(version)
-        await self.db.flush()
 
-        # Create default config for the project
+        # Default config for the project
         config = ProjectConfig(
-            project_id=project.id,
             theme={},
             map_settings={},
             status_colors={
@@ -102,19 +91,29 @@ class ProjectService:
             popup_config={},
             filter_config={},
         )
-        self.db.add(config)
 
+        # Attached through relationships so one flush inserts all three and
+        # project.versions is already loaded for the response
+        project = Project(
+            slug=data.slug,
+            name=data.name,
+            name_ar=data.name_ar,
+            description=data.description,
+            created_by=user_id,
+            is_active=True,
+            versions=[version],
+            config=config,
+        )
+        self.db.add(project)
         await self.db.commit()
-        await self.db.refresh(project)
 
-        # Reload with versions
-        return await self.get_project_by_id(project.id)
+        return project
 
     async def update_project(
         self, slug: str, data: ProjectUpdate
     ) -> Optional[Project]:
         """Update project fields."""
-        project = await self.get_project_by_slug(slug)
+        project = await self.get_project_by_slug_light(slug)
         if not project:
             return None
 
@@ -124,20 +123,18 @@ class ProjectService:
 
         await self.db.commit()
         await self.db.refresh(project)
+        invalidate_project_slug(slug)
         return project
 
     async def delete_project(self, slug: str) -> bool:
         """Soft delete project (set is_active=False)."""
-        result = await self.db.execute(
-            select(Project).where(Project.slug == slug, Project.is_active == True)
-        )
-        project = result.scalar_one_or_none()
-
+        project = await self.get_project_by_slug_light(slug)
         if not project:
             return False
 
         project.is_active = False
         await self.db.commit()
+        invalidate_project_slug(slug)
         return True
 
     async def create_version(
@@ -151,49 +148,41 @@ class ProjectService:
 
         Only one draft version allowed at a time.
         """
-        project = await self.get_project_by_id(project_id)
-        if not project:
+        # Project existence, latest version and any draft in one query
+        row = (await self.db.execute(
+            select(
+                func.max(ProjectVersion.version_number),
+                func.max(ProjectVersion.version_number).filter(
+                    ProjectVersion.status == "draft"
+                ),
+            )
+            .select_from(Project)
+            .outerjoin(ProjectVersion, ProjectVersion.project_id == Project.id)
+            .where(Project.id == project_id)
+            .group_by(Project.id)
+        )).first()
+        if row is None:
             return None
 
-        # Check if there's already a draft version
-        draft_result = await self.db.execute(
-            select(ProjectVersion).where(
-                ProjectVersion.project_id == project_id,
-                ProjectVersion.status == "draft"
-            ).limit(1)
-        )
-        existing_draft = draft_result.scalar_one_or_none()
-        if existing_draft:
+        max_version, draft_version = row
+        if draft_version is not None:
             raise ValueError(
-                f"Cannot create new version: draft version {existing_draft.version_number} already exists. "
+                f"Cannot create new version: draft version {draft_version} already exists. "
                 "Publish or delete the existing draft first."
             )
 
-        # Get next version number
-        result = await self.db.execute(
-            select(func.max(ProjectVersion.version_number))
-            .where(ProjectVersion.project_id == project_id)
-        )
-        max_version = result.scalar_one() or 0
-        new_version_number = max_version + 1
-
         # Create new version (just a release tag)
         version = ProjectVersion(
             project_id=project_id,
-            version_number=new_version_number,
+            version_number=(max_version or 0) + 1,
             status="draft",
         )
         self.db.add(version)
 
-        # Ensure project has a config (create default if not exists)
-        config_result = await self.db.execute(
-            select(ProjectConfig).where(ProjectConfig.project_id == project_id)
-        )
-        existing_config = config_result.scalar_one_or_none()
-
-        if not existing_config:
-            # Create default config for the project
-            config = ProjectConfig(
+        # Ensure project has a config (default one unless it already exists)
+        await self.db.execute(
+            pg_insert(ProjectConfig)
+            .values(
                 project_id=project_id,
                 theme={},
                 map_settings={},
@@ -207,10 +196,10 @@ class ProjectService:
                 popup_config={},
                 filter_config={},
             )
-            self.db.add(config)
+            .on_conflict_do_nothing(index_elements=["project_id"])
+        )
 
         await self.db.commit()
-        await self.db.refresh(version)
 
         return version
 
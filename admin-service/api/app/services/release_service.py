@@ -4,22 +4,27 @@ Release Service
 Handles release ID generation, manifest building, and publish operations.
 """
 import hashlib
-import json
-import secrets
+import os
 import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import bindparam, exists, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.lib.project_cache import get_active_project_by_slug
+from app.models.building import Building
 from app.models.config import ProjectConfig
+from app.models.job import Job
 from app.models.overlay import Overlay
 from app.models.project import Project
 from app.models.version import ProjectVersion
 from app.schemas.config import DEFAULT_INTERACTION_COLORS, DEFAULT_STATUS_COLORS
 from app.schemas.release import (
+    BuildingManifestInfo,
     ReleaseConfig,
     ReleaseManifest,
     ReleaseOverlay,
@@ -28,6 +33,35 @@ from app.schemas.release import (
 )
 
 
+# Active project and one of its versions by slug + number
+_PROJECT_VERSION_BY_SLUG = (
+    select(Project, ProjectVersion)
+    .join(ProjectVersion, ProjectVersion.project_id == Project.id)
+    .where(
+        Project.slug == bindparam("slug"),
+        Project.is_active == True,
+        ProjectVersion.version_number == bindparam("version_number"),
+    )
+)
+
+# Same, plus the project's config (None if the project has none)
+_PROJECT_VERSION_CONFIG_BY_SLUG = (
+    _PROJECT_VERSION_BY_SLUG
+    .add_columns(ProjectConfig)
+    .outerjoin(ProjectConfig, ProjectConfig.project_id == Project.id)
+)
+
+
+# Serializes manifests straight to JSON bytes (no intermediate str)
+_MANIFEST_JSON = TypeAdapter(ReleaseManifest)
+
+# SHA256 state after the checksum's fixed "[" prefix; copied per checksum
+_CHECKSUM_BASE = hashlib.sha256(b"[")
+
+# (epoch second, formatted timestamp) of the last generated release ID
+_release_id_stamp: Tuple[int, str] = (-1, "")
+
+
 def generate_release_id() -> str:
     """
     Generate a unique, sortable release ID.
@@ -35,9 +69,16 @@ def generate_release_id() -> str:
     Format: rel_{YYYYMMDDHHMMSS}_{random_hex}
     Example: rel_20240115100000_a1b2c3d4
     """
-    timestamp = time.strftime("%Y%m%d%H%M%S")
-    random_suffix = secrets.token_hex(4)
-    return f"rel_{timestamp}_{random_suffix}"
+    global _release_id_stamp
+
+    # Format the timestamp once per second, not once per ID
+    second = int(time.time())
+    if _release_id_stamp[0] != second:
+        stamp = "%04d%02d%02d%02d%02d%02d" % time.localtime(second)[:6]
+        _release_id_stamp = (second, stamp)
+
+    random_suffix = os.urandom(4).hex()
+    return f"rel_{_release_id_stamp[1]}_{random_suffix}"
 
 
 class ReleaseService:
@@ -45,38 +86,58 @@ class ReleaseService:
 
     def __init__(self, db: AsyncSession):
         self.db = db
+        # Lookups memoized for the lifetime of the service (one request/job)
+        self._versions: Dict[Tuple[str, int], Tuple[Project, ProjectVersion]] = {}
+        self._configs: Dict[UUID, Optional[ProjectConfig]] = {}
 
     async def get_project_by_slug(self, slug: str) -> Optional[Project]:
         """Get project by slug."""
-        result = await self.db.execute(
-            select(Project).where(
-                Project.slug == slug,
-                Project.is_active == True
-            )
-        )
-        return result.scalar_one_or_none()
+        return await get_active_project_by_slug(self.db, slug)
 
     async def get_version(
         self,
         project_slug: str,
         version_number: int,
     ) -> Optional[Tuple[Project, ProjectVersion]]:
-        """Get project and version."""
-        project = await self.get_project_by_slug(project_slug)
-        if not project:
+        """Get project and version (single JOIN query, memoized)."""
+        key = (project_slug, version_number)
+        if key in self._versions:
+            return self._versions[key]
+
+        result = await self.db.execute(
+            _PROJECT_VERSION_BY_SLUG,
+            {"slug": project_slug, "version_number": version_number},
+        )
+        row = result.first()
+        if not row:
             return None
 
+        self._versions[key] = (row[0], row[1])
+        return self._versions[key]
+
+    async def _get_version_with_config(
+        self,
+        project_slug: str,
+        version_number: int,
+    ) -> Optional[Tuple[Project, ProjectVersion, Optional[ProjectConfig]]]:
+        """Get project, version and the project's config in one query (memoized)."""
+        cached = self._versions.get((project_slug, version_number))
+        if cached and cached[0].id in self._configs:
+            project, version = cached
+            return project, version, self._configs[project.id]
+
         result = await self.db.execute(
-            select(ProjectVersion).where(
-                ProjectVersion.project_id == project.id,
-                ProjectVersion.version_number == version_number
-            )
+            _PROJECT_VERSION_CONFIG_BY_SLUG,
+            {"slug": project_slug, "version_number": version_number},
         )
-        version = result.scalar_one_or_none()
-        if not version:
+        row = result.first()
+        if not row:
             return None
 
-        return project, version
+        project, version, config = row
+        self._versions[(project_slug, version_number)] = (project, version)
+        self._configs[project.id] = config
+        return project, version, config
 
     async def validate_for_publish(
         self,
@@ -102,38 +163,31 @@ class ReleaseService:
         if version.status != "draft":
             errors.append("Only draft versions can be published")
 
-        # Check config exists
-        config_result = await self.db.execute(
-            select(ProjectConfig).where(
-                ProjectConfig.project_id == project.id
+        # Check config, overlays and a successful build in one query
+        checks = (await self.db.execute(
+            select(
+                exists().where(
+                    ProjectConfig.project_id == project.id
+                ).label("has_config"),
+                exists().where(
+                    Overlay.project_id == project.id
+                ).label("has_overlays"),
+                exists().where(
+                    Job.project_id == project.id,
+                    Job.version_id == version.id,
+                    Job.job_type == "build",
+                    Job.status == "completed"
+                ).label("has_build"),
             )
-        )
-        config = config_result.scalar_one_or_none()
-        if not config:
+        )).one()
+
+        if not checks.has_config:
             warnings.append("No configuration defined, will use defaults")
 
-        # Check overlays exist
-        overlay_result = await self.db.execute(
-            select(Overlay).where(
-                Overlay.project_id == project.id
-            ).limit(1)
-        )
-        has_overlays = overlay_result.scalar_one_or_none() is not None
-        if not has_overlays:
+        if not checks.has_overlays:
             warnings.append("No overlays defined")
 
-        # Check if there's a successful build for this version
-        from app.models.job import Job
-        build_job_result = await self.db.execute(
-            select(Job).where(
-                Job.project_id == project.id,
-                Job.version_id == version.id,
-                Job.job_type == "build",
-                Job.status == "completed"
-            ).limit(1)
-        )
-        has_build = build_job_result.scalar_one_or_none() is not None
-        if not has_build:
+        if not checks.has_build:
             warnings.append("No build found - consider running build first to generate tiles")
 
         is_valid = len(errors) == 0
@@ -162,19 +216,67 @@ class ReleaseService:
         Returns:
             ReleaseManifest or None if project/version not found
         """
-        result = await self.get_version(project_slug, version_number)
+        result = await self._get_version_with_config(project_slug, version_number)
         if not result:
             return None
 
-        project, version = result
-
-        # Get config
-        config_result = await self.db.execute(
-            select(ProjectConfig).where(
-                ProjectConfig.project_id == project.id
+        project, version, config = result
+
+        # Get overlays for this level as plain rows (no ORM instances)
+        overlay_query = (
+            select(
+                Overlay.ref,
+                Overlay.overlay_type,
+                Overlay.geometry,
+                Overlay.label,
+                Overlay.label_position,
+                Overlay.props,
+                Overlay.source_level,
+                Overlay.sort_order,
             )
+            .where(Overlay.project_id == project.id)
+            # overlay_type breaks (sort_order, ref) ties so the checksum input
+            # order is deterministic ((type, ref) is unique per project)
+            .order_by(Overlay.sort_order, Overlay.ref, Overlay.overlay_type)
         )
-        config = config_result.scalar_one_or_none()
+        if level == "project":
+            # Project level: only zones (they have source_level matching their ref)
+            overlay_query = overlay_query.where(Overlay.overlay_type == "zone")
+        else:
+            # Zone level: overlays belonging to this zone (source_level matches zone ref).
+            # Only zone levels read view_box, so only they fetch it.
+            overlay_query = overlay_query.add_columns(Overlay.view_box).where(
+                Overlay.source_level == level,
+                Overlay.overlay_type != "zone"
+            )
+
+        # One pass over the streamed rows: each overlay dict is folded into
+        # the checksum and wrapped for the manifest, then the row is dropped
+        release_overlays = []
+        checksum_hash = _CHECKSUM_BASE.copy()
+        zone_view_box = None
+        overlay_rows = await self.db.stream(
+            overlay_query.execution_options(yield_per=500)
+        )
+        async for o in overlay_rows:
+            data = {
+                "ref": o.ref,
+                "overlay_type": o.overlay_type,
+                "geometry": o.geometry,
+                "label": o.label,
+                "label_position": o.label_position,
+                "props": o.props or {},
+                "layer": o.source_level,
+                "sort_order": o.sort_order or 0,
+            }
+            self._update_checksum(checksum_hash, data, first=not release_overlays)
+            release_overlays.append(ReleaseOverlay.model_construct(**data))
+
+            # For zone levels, use the viewBox from overlays (stored during SVG import)
+            # This is critical: overlays use SVG viewBox coordinate system, so the manifest
+            # must use the same viewBox for correct rendering
+            if level != "project" and zone_view_box is None and o.view_box:
+                zone_view_box = o.view_box
 
         # Build config section - extract from JSONB fields
         map_settings = (config.map_settings or {}) if config else {}
@@ -182,7 +284,7 @@ class ReleaseService:
         zoom_settings = map_settings.get("zoom", {})
 
         # Determine viewBox: use zone-specific viewBox if available, otherwise project config
-        default_view_box = map_settings.get("defaultViewBox", "0 0 4096 4096")
+        default_view_box = zone_view_box or map_settings.get("defaultViewBox", "0 0 4096 4096")
 
         release_config = ReleaseConfig(
             default_view_box=default_view_box,
@@ -197,57 +299,6 @@ class ReleaseService:
             interaction_styles=DEFAULT_INTERACTION_COLORS,
         )
 
-        # Get overlays filtered by level
-        overlay_result = await self.db.execute(
-            select(Overlay)
-            .where(Overlay.project_id == project.id)
-            .order_by(Overlay.sort_order, Overlay.ref)
-        )
-        all_overlays = list(overlay_result.scalars().all())
-
-        # Filter overlays based on level
-        if level == "project":
-            # Project level: only zones (they have source_level matching their ref)
-            filtered_overlays = [o for o in all_overlays if o.overlay_type == "zone"]
-        else:
-            # Zone level: overlays belonging to this zone (source_level matches zone ref)
-            filtered_overlays = [o for o in all_overlays if o.source_level == level and o.overlay_type != "zone"]
-
-        # For zone levels, use the viewBox from overlays (stored during SVG import)
-        # This is critical: overlays use SVG viewBox coordinate system, so the manifest
-        # must use the same viewBox for correct rendering
-        zone_view_box = None
-        if level != "project" and filtered_overlays:
-            for o in filtered_overlays:
-                if o.view_box:
-                    zone_view_box = o.view_box
-                    break
-
-        # Override viewBox for zone levels if zone-specific viewBox is available
-        if zone_view_box:
-            release_config = ReleaseConfig(
-                default_view_box=zone_view_box,
-                default_zoom=release_config.default_zoom,
-                default_locale=release_config.default_locale,
-                supported_locales=release_config.supported_locales,
-                status_styles=release_config.status_styles,
-                interaction_styles=release_config.interaction_styles,
-            )
-
-        release_overlays = [
-            ReleaseOverlay(
-                ref=o.ref,
-                overlay_type=o.overlay_type,
-                geometry=o.geometry,
-                label=o.label,
-                label_position=o.label_position,
-                props=o.props or {},
-                layer=o.source_level,
-                sort_order=o.sort_order or 0,
-            )
-            for o in filtered_overlays
-        ]
-
         # Build tiles section if metadata provided
         tiles = None
         if tiles_metadata:
@@ -261,12 +312,11 @@ class ReleaseService:
                 height=tiles_metadata.get("height", 4096),
             )
 
-        # Calculate checksum of overlay data
-        overlay_data = [o.model_dump() for o in release_overlays]
-        checksum = self._calculate_checksum(overlay_data)
+        # Checksum of overlay data (closes the JSON array hashed above)
+        checksum_hash.update(b"]")
+        checksum = f"sha256:{checksum_hash.hexdigest()}"
 
         # Get building manifest info (only for project level)
-        from app.schemas.release import BuildingManifestInfo
         buildings = []
         if level == "project":
             buildings = await self._get_building_manifest_infos(project.id)
@@ -289,9 +339,6 @@ class ReleaseService:
         project_id: UUID,
     ) -> List:
         """Get building manifest info for all active buildings."""
-        from app.models.building import Building
-        from app.schemas.release import BuildingManifestInfo
-
         result = await self.db.execute(
             select(Building).where(
                 Building.project_id == project_id,
@@ -315,7 +362,8 @@ class ReleaseService:
         if not project:
             return []
 
-        # Find unique source_levels for non-zone overlays (these are the zones with content)
+        # Find unique source_levels for non-zone overlays (these are the zones with content).
+        # Predicates match the ix_overlays_zone_levels partial index.
         overlay_result = await self.db.execute(
             select(Overlay.source_level)
             .where(
@@ -324,16 +372,26 @@ class ReleaseService:
                 Overlay.source_level.isnot(None),
                 Overlay.source_level != "project",
             )
-            .distinct()
+            .group_by(Overlay.source_level)
         )
         levels = [row[0] for row in overlay_result.all() if row[0]]
         return levels
 
-    def _calculate_checksum(self, data: List[Dict]) -> str:
-        """Calculate SHA256 checksum of data."""
-        json_str = json.dumps(data, sort_keys=True, default=str)
-        hash_obj = hashlib.sha256(json_str.encode())
-        return f"sha256:{hash_obj.hexdigest()}"
+    def manifest_to_bytes(self, manifest: ReleaseManifest) -> bytes:
+        """Serialize a manifest to the JSON bytes uploaded as release.json."""
+        return _MANIFEST_JSON.dump_json(manifest, indent=2)
+
+    def _update_checksum(self, hash_obj: Any, item: Dict, first: bool) -> None:
+        """
+        Fold one item into a running SHA256 checksum.
+
+        The hash starts from _CHECKSUM_BASE and is closed with b"]", so
+        the digest equals hashing orjson.dumps(items) (sorted keys,
+        compact) in one go without holding the serialized list.
+        """
+        if not first:
+            hash_obj.update(b",")
+        hash_obj.update(orjson.dumps(item, option=orjson.OPT_SORT_KEYS, default=str))
 
     async def mark_version_published(
         self,
@@ -343,18 +401,19 @@ class ReleaseService:
         user_id: UUID,
     ) -> None:
         """Update version record after successful publish."""
-        result = await self.db.execute(
-            select(ProjectVersion).where(ProjectVersion.id == version_id)
+        # Single UPDATE by primary key; a loaded instance is synced in place
+        await self.db.execute(
+            update(ProjectVersion)
+            .where(ProjectVersion.id == version_id)
+            .values(
+                status="published",
+                release_id=release_id,
+                release_url=release_url,
+                published_at=datetime.utcnow(),
+                published_by=user_id,
+            )
         )
-        version = result.scalar_one_or_none()
-
-        if version:
-            version.status = "published"
-            version.release_id = release_id
-            version.release_url = release_url
-            version.published_at = datetime.utcnow()
-            version.published_by = user_id
-            await self.db.commit()
+        await self.db.commit()
 
     async def update_project_current_release(
         self,
@@ -362,17 +421,9 @@ class ReleaseService:
         release_id: str,
     ) -> None:
         """Update project's current release pointer."""
-        result = await self.db.execute(
-            select(Project).where(Project.id == project_id)
+        await self.db.execute(
+            update(Project)
+            .where(Project.id == project_id)
+            .values(current_release_id=release_id)
         )
-        project = result.scalar_one_or_none()
-
-        if project:
-            project.current_release_id = release_id
-            await self.db.commit()
-
-
-# Singleton for release ID generation
-def get_release_id() -> str:
-    """Get a new release ID."""
-    return generate_release_id()
+        await self.db.commit()
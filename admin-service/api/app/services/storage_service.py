@@ -5,11 +5,16 @@ High-level storage operations with project/asset-aware paths.
 Wraps the R2 adapter with business logic for Master Plan assets.
 """
 import uuid
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
 
 from app.infra.r2_storage import r2_storage
 from app.lib.config import settings
 
+# Tile PUTs in flight in upload_tiles. They run on the default thread
+# pool, so values above its size only queue there.
+TILE_UPLOAD_CONCURRENCY = 16
+
 
 class StorageService:
     """
@@ -27,6 +32,16 @@ class StorageService:
 
     # --- Path Generation ---
 
+    def get_uploads_prefix(
+        self,
+        project_slug: str,
+        asset_type: Optional[str] = None,
+    ) -> str:
+        """Generate storage prefix for a project's uploads (optionally one asset type)."""
+        if asset_type:
+            return f"{self.base_prefix}/{project_slug}/uploads/{asset_type}/"
+        return f"{self.base_prefix}/{project_slug}/uploads/"
+
     def get_upload_path(
         self,
         project_slug: str,
@@ -55,7 +70,10 @@ class StorageService:
         extension: str = "png",
     ) -> str:
         """Generate storage path for tile images."""
-        return f"{self.base_prefix}/{project_slug}/releases/{release_id}/tiles/{z}/{x}_{y}.{extension}"
+        return "/".join((
+            self.base_prefix, project_slug, "releases", release_id, "tiles",
+            str(z), f"{x}_{y}.{extension}",
+        ))
 
     # --- Upload Operations ---
 
@@ -188,11 +206,7 @@ class StorageService:
         asset_type: Optional[str] = None,
     ) -> List[str]:
         """List uploaded files for a project."""
-        if asset_type:
-            prefix = f"{self.base_prefix}/{project_slug}/uploads/{asset_type}/"
-        else:
-            prefix = f"{self.base_prefix}/{project_slug}/uploads/"
-
+        prefix = self.get_uploads_prefix(project_slug, asset_type)
         return await self.storage.list_files(prefix)
 
     async def list_uploads_with_metadata(
@@ -201,11 +215,7 @@ class StorageService:
         asset_type: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """List uploaded files with metadata."""
-        if asset_type:
-            prefix = f"{self.base_prefix}/{project_slug}/uploads/{asset_type}/"
-        else:
-            prefix = f"{self.base_prefix}/{project_slug}/uploads/"
-
+        prefix = self.get_uploads_prefix(project_slug, asset_type)
         return await self.storage.list_files_with_metadata(prefix)
 
     # --- Release Operations ---
@@ -280,6 +290,40 @@ class StorageService:
 
         return storage_path
 
+    async def upload_tiles(
+        self,
+        key_prefix: str,
+        tiles_dir: Path,
+        tile_files: Iterable[Path],
+        concurrency: int = TILE_UPLOAD_CONCURRENCY,
+    ) -> int:
+        """
+        Upload generated tile files concurrently.
+
+        Each file is stored at {key_prefix}{path relative to tiles_dir}, so
+        a {level}/{x}_{y}.{format} pyramid keeps its layout. The content
+        type comes from each file's own extension.
+
+        Returns:
+            Number of tiles uploaded
+        """
+        return await self.storage.upload_local_files(
+            (
+                (
+                    f"{key_prefix}{tile_file.relative_to(tiles_dir).as_posix()}",
+                    tile_file,
+                    self._tile_content_type(tile_file.suffix),
+                )
+                for tile_file in tile_files
+            ),
+            concurrency=concurrency,
+        )
+
+    def _tile_content_type(self, suffix: str) -> str:
+        """MIME type for a tile file extension (".webp" -> "image/webp")."""
+        extension = suffix.lstrip(".").lower()
+        return "image/jpeg" if extension in ("jpg", "jpeg") else f"image/{extension}"
+
     async def list_release_files(
         self,
         project_slug: str,
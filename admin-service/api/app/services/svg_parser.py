@@ -7,7 +7,18 @@ Used for importing overlays from SVG designs.
 import re
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Number tokens in path data (including negatives and decimals)
+_NUMBER_RE = re.compile(r"-?\d+\.?\d*")
+# Common overlay ID prefixes stripped from display labels
+_LABEL_PREFIX_RE = re.compile(r"^(unit|zone|poi|path)-?", re.IGNORECASE)
+_LABEL_SEP_RE = re.compile(r"[_-]+")
+# Leading numeric part of a dimension such as "100px"
+_DIMENSION_RE = re.compile(r"^(\d+\.?\d*)")
+
+# Characters of SVG source fed to the streaming parser at a time
+_PARSE_CHUNK_SIZE = 64 * 1024
 
 
 @dataclass
@@ -52,13 +63,29 @@ class SVGParserService:
         Returns:
             List of ParsedOverlay objects
         """
-        root = ET.fromstring(svg_content)
-        overlays = []
+        return self.parse_svg_full(svg_content, id_pattern=id_pattern)[3]
+
+    def parse_svg_full(
+        self,
+        svg_content: str,
+        id_pattern: Optional[str] = None,
+    ) -> Tuple[Optional[str], Optional[float], Optional[float], List[ParsedOverlay]]:
+        """
+        Parse SVG content once for its viewBox, dimensions and paths.
 
-        # Find all path elements (with or without namespace)
-        paths = self._find_all_paths(root)
+        Args:
+            svg_content: SVG file content as string
+            id_pattern: Optional regex to filter paths by ID
 
-        for path in paths:
+        Returns:
+            Tuple of (viewbox, width, height, overlays)
+        """
+        root_attrs: Dict[str, str] = {}
+        overlays = []
+        id_regex = re.compile(id_pattern) if id_pattern else None
+
+        # Stream path elements (with or without namespace)
+        for path in self._iter_paths(svg_content, root_attrs):
             path_id = path.get("id", "")
             path_data = path.get("d", "")
 
@@ -66,12 +93,13 @@ class SVGParserService:
                 continue
 
             # Filter by pattern if provided
-            if id_pattern and not re.match(id_pattern, path_id):
+            if id_regex and not id_regex.match(path_id):
                 continue
 
-            # Calculate bounds and centroid
-            bounds = self._calculate_bounds(path_data)
-            centroid = self._calculate_centroid(path_data, bounds)
+            # Calculate bounds and centroid from one coordinate extraction
+            coords = self._extract_coordinates(path_data)
+            bounds = self._calculate_bounds(coords)
+            centroid = self._calculate_centroid(coords, bounds)
 
             overlays.append(ParsedOverlay(
                 id=path_id or f"path-{len(overlays)}",
@@ -80,7 +108,8 @@ class SVGParserService:
                 bounds=bounds,
             ))
 
-        return overlays
+        width, height = self._dimensions_from_attrs(root_attrs)
+        return self._viewbox_from_attrs(root_attrs), width, height, overlays
 
     def parse_svg_with_groups(
         self,
@@ -103,9 +132,7 @@ class SVGParserService:
             paths = []
 
             # Find paths directly in this group
-            for path in group.findall(f"./{{{self.SVG_NS}}}path"):
-                self._process_path(path, paths)
-            for path in group.findall("./path"):
+            for path in self._child_paths(group):
                 self._process_path(path, paths)
 
             if paths:
@@ -113,9 +140,7 @@ class SVGParserService:
 
         # Also get root-level paths
         root_paths = []
-        for path in root.findall(f"./{{{self.SVG_NS}}}path"):
-            self._process_path(path, root_paths)
-        for path in root.findall("./path"):
+        for path in self._child_paths(root):
             self._process_path(path, root_paths)
 
         if root_paths:
@@ -125,36 +150,11 @@ class SVGParserService:
 
     def get_viewbox(self, svg_content: str) -> Optional[str]:
         """Extract viewBox from SVG (case-insensitive)."""
-        root = ET.fromstring(svg_content)
-        # Try standard camelCase first
-        viewbox = root.get("viewBox")
-        if viewbox:
-            return viewbox
-        # Try lowercase (also valid in SVG)
-        viewbox = root.get("viewbox")
-        if viewbox:
-            return viewbox
-        # Try checking all attributes case-insensitively
-        for attr, value in root.attrib.items():
-            if attr.lower() == "viewbox":
-                return value
-        return None
+        return self._viewbox_from_attrs(self._root_attrs(svg_content))
 
     def get_dimensions(self, svg_content: str) -> Tuple[Optional[float], Optional[float]]:
         """Extract width and height from SVG."""
-        root = ET.fromstring(svg_content)
-
-        width = self._parse_dimension(root.get("width"))
-        height = self._parse_dimension(root.get("height"))
-
-        # Fall back to viewBox if dimensions not set
-        if (width is None or height is None) and root.get("viewBox"):
-            parts = root.get("viewBox").split()
-            if len(parts) == 4:
-                width = width or float(parts[2])
-                height = height or float(parts[3])
-
-        return width, height
+        return self._dimensions_from_attrs(self._root_attrs(svg_content))
 
     def convert_to_overlays(
         self,
@@ -192,19 +192,95 @@ class SVGParserService:
             for p in parsed
         ]
 
-    def _find_all_paths(self, root: ET.Element) -> List[ET.Element]:
-        """Find all path elements in SVG."""
-        paths = []
-        paths.extend(root.findall(f".//{{{self.SVG_NS}}}path"))
-        paths.extend(root.findall(".//path"))
-        return paths
+    def _iter_paths(
+        self,
+        svg_content: str,
+        root_attrs: Optional[Dict[str, str]] = None,
+    ) -> Iterator[ET.Element]:
+        """
+        Stream path elements in document order without building the full tree.
+
+        Each element is cleared once the caller moves on, so memory stays
+        bounded by the document depth rather than its size. Callers must
+        read what they need from a path before advancing. If `root_attrs`
+        is given, it is filled with the root element's attributes.
+        """
+        tags = (f"{{{self.SVG_NS}}}path", "path")
+        parser = ET.XMLPullParser(events=("start", "end"))
+        seen_root = False
+
+        for offset in range(0, len(svg_content) + _PARSE_CHUNK_SIZE, _PARSE_CHUNK_SIZE):
+            if offset < len(svg_content):
+                parser.feed(svg_content[offset:offset + _PARSE_CHUNK_SIZE])
+            else:
+                parser.close()
+
+            for event, elem in parser.read_events():
+                if event == "start":
+                    if not seen_root:
+                        seen_root = True
+                        if root_attrs is not None:
+                            root_attrs.update(elem.attrib)
+                    continue
+                if elem.tag in tags:
+                    yield elem
+                elem.clear()
+
+    def _root_attrs(self, svg_content: str) -> Dict[str, str]:
+        """Read the root element's attributes, parsing only up to its start tag."""
+        parser = ET.XMLPullParser(events=("start",))
+
+        for offset in range(0, len(svg_content), _PARSE_CHUNK_SIZE):
+            parser.feed(svg_content[offset:offset + _PARSE_CHUNK_SIZE])
+            for _, elem in parser.read_events():
+                return dict(elem.attrib)
+
+        # No root element: close() raises ParseError like ET.fromstring
+        parser.close()
+        return {}
+
+    def _viewbox_from_attrs(self, attrs: Dict[str, str]) -> Optional[str]:
+        """Get the viewBox from root attributes (case-insensitive)."""
+        # Try standard camelCase first
+        viewbox = attrs.get("viewBox")
+        if viewbox:
+            return viewbox
+        # Try lowercase (also valid in SVG)
+        viewbox = attrs.get("viewbox")
+        if viewbox:
+            return viewbox
+        # Try checking all attributes case-insensitively
+        for attr, value in attrs.items():
+            if attr.lower() == "viewbox":
+                return value
+        return None
+
+    def _dimensions_from_attrs(
+        self,
+        attrs: Dict[str, str],
+    ) -> Tuple[Optional[float], Optional[float]]:
+        """Get width and height from root attributes."""
+        width = self._parse_dimension(attrs.get("width"))
+        height = self._parse_dimension(attrs.get("height"))
+
+        # Fall back to viewBox if dimensions not set
+        if (width is None or height is None) and attrs.get("viewBox"):
+            parts = attrs.get("viewBox").split()
+            if len(parts) == 4:
+                width = width or float(parts[2])
+                height = height or float(parts[3])
+
+        return width, height
 
     def _find_all_groups(self, root: ET.Element) -> List[ET.Element]:
-        """Find all group elements in SVG."""
-        groups = []
-        groups.extend(root.findall(f".//{{{self.SVG_NS}}}g"))
-        groups.extend(root.findall(".//g"))
-        return groups
+        """Find all group elements in SVG (one tree walk, document order)."""
+        tags = (f"{{{self.SVG_NS}}}g", "g")
+        return [el for el in root.iter() if el.tag in tags]
+
+    def _child_paths(self, parent: ET.Element) -> List[ET.Element]:
+        """Find path elements that are direct children of an element."""
+        tags = (f"{{{self.SVG_NS}}}path", "path")
+        return [el for el in parent if el.tag in tags]
 
     def _process_path(
         self,
@@ -218,8 +294,9 @@ class SVGParserService:
         if not path_data:
             return
 
-        bounds = self._calculate_bounds(path_data)
-        centroid = self._calculate_centroid(path_data, bounds)
+        coords = self._extract_coordinates(path_data)
+        bounds = self._calculate_bounds(coords)
+        centroid = self._calculate_centroid(coords, bounds)
 
         paths.append(ParsedOverlay(
             id=path_id or f"path-{len(paths)}",
@@ -230,16 +307,13 @@ class SVGParserService:
 
     def _calculate_bounds(
         self,
-        path_data: str,
+        coords: List[Tuple[float, float]],
     ) -> Tuple[float, float, float, float]:
-        """Calculate bounding box from path data."""
-        coords = self._extract_coordinates(path_data)
-
+        """Calculate bounding box from extracted path coordinates."""
         if not coords:
             return (0, 0, 0, 0)
 
-        xs = [c[0] for c in coords]
-        ys = [c[1] for c in coords]
+        xs, ys = zip(*coords)
 
         return (min(xs), min(ys), max(xs), max(ys))
 
@@ -254,24 +328,16 @@ class SVGParserService:
         """
         # Remove commands to get just numbers
         # Match number patterns including negatives and decimals
-        numbers = re.findall(r"-?\d+\.?\d*", path_data)
-        coords = []
+        numbers = _NUMBER_RE.findall(path_data)
 
-        i = 0
-        while i < len(numbers) - 1:
-            try:
-                x = float(numbers[i])
-                y = float(numbers[i + 1])
-                coords.append((x, y))
-                i += 2
-            except (ValueError, IndexError):
-                i += 1
-
-        return coords
+        # Every match is a valid float literal, so convert in one pass and
+        # pair up x/y (a trailing odd number is dropped)
+        values = list(map(float, numbers))
+        return list(zip(values[0::2], values[1::2]))
 
     def _calculate_centroid(
         self,
-        path_data: str,
+        coords: List[Tuple[float, float]],
         bounds: Tuple[float, float, float, float],
     ) -> Tuple[float, float]:
         """
@@ -280,8 +346,6 @@ class SVGParserService:
         Uses polylabel for complex polygons if available,
         falls back to bounding box center.
         """
-        coords = self._extract_coordinates(path_data)
-
         if len(coords) < 3:
             # For simple shapes, use bounding box center
             return (
@@ -299,9 +363,8 @@ class SVGParserService:
 
         except ImportError:
             # Fallback to simple centroid
-            avg_x = sum(c[0] for c in coords) / len(coords)
-            avg_y = sum(c[1] for c in coords) / len(coords)
-            return (avg_x, avg_y)
+            xs, ys = zip(*coords)
+            return (sum(xs) / len(coords), sum(ys) / len(coords))
 
         except Exception:
             # Fallback to bounding box center
@@ -313,9 +376,9 @@ class SVGParserService:
     def _extract_label(self, path_id: str) -> str:
         """Extract display label from path ID."""
         # Remove common prefixes
-        label = re.sub(r"^(unit|zone|poi|path)-?", "", path_id, flags=re.IGNORECASE)
+        label = _LABEL_PREFIX_RE.sub("", path_id)
         # Replace underscores/hyphens with spaces
-        label = re.sub(r"[_-]+", " ", label)
+        label = _LABEL_SEP_RE.sub(" ", label)
         # Title case
         return label.strip() or path_id
 
@@ -325,7 +388,7 @@ class SVGParserService:
             return None
 
         # Remove units
-        match = re.match(r"^(\d+\.?\d*)", value)
+        match = _DIMENSION_RE.match(value)
         if match:
             return float(match.group(1))
         return None
@@ -5,11 +5,49 @@ Generates DZI (Deep Zoom Image) tiles from base map images.
 Uses Pillow for image processing.
 """
 import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, Optional, Tuple
 
 from PIL import Image
 
+# Threads encoding tiles in parallel (Pillow's encoders release the GIL)
+ENCODE_WORKERS = os.cpu_count() or 4
+
+# libwebp effort (0-6) for full-resolution tiles and for the smaller
+# overview levels; same quality, the low levels trade size for speed
+WEBP_METHOD = 4
+WEBP_OVERVIEW_METHOD = 0
+
+# Minimum seconds between progress reports (completion is always reported)
+PROGRESS_MIN_INTERVAL = 0.5
+
+
+def _throttle_progress(
+    callback: Callable[[int], None],
+    min_interval: float = PROGRESS_MIN_INTERVAL,
+) -> Callable[[int], None]:
+    """
+    Wrap a progress callback so it only fires when the percent changes and
+    at least `min_interval` seconds have passed (100% always goes through).
+    """
+    last_percent = -1
+    last_time = float("-inf")
+
+    def report(percent: int) -> None:
+        nonlocal last_percent, last_time
+        now = time.monotonic()
+        if percent == last_percent:
+            return
+        if percent < 100 and now - last_time < min_interval:
+            return
+        last_percent, last_time = percent, now
+        callback(percent)
+
+    return report
+
 
 class TileService:
     """
@@ -49,53 +87,78 @@ class TileService:
         Returns:
             dict with tile metadata (width, height, levels, tile_count)
         """
-        # Load image
+        # Load image (decoded up front so worker threads share the pixels)
         image = Image.open(source_path)
+        image.load()
         width, height = image.size
 
         # Convert to RGB if necessary (handles RGBA, palette, etc.)
         if image.mode not in ("RGB", "RGBA"):
             image = image.convert("RGB")
 
-        # Calculate number of levels
+        # Calculate number of levels: 1 + the number of halvings until the
+        # largest side fits in one tile (max_dim // 2**k <= tile_size)
         max_dim = max(width, height)
-        levels = 1
-        temp = max_dim
-        while temp > self.tile_size:
-            temp //= 2
-            levels += 1
+        levels = 1 + (max_dim // (self.tile_size + 1)).bit_length()
 
         # Create output directory
         Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-        # Generate tiles at each level
+        if progress_callback:
+            progress_callback = _throttle_progress(progress_callback)
+
+        # Generate tiles at each level, encoding tiles on a thread pool
+        with ThreadPoolExecutor(max_workers=ENCODE_WORKERS) as executor:
+            tile_count = self._generate_levels(
+                image, output_dir, levels, executor, progress_callback
+            )
+
+        return {
+            "width": width,
+            "height": height,
+            "tile_size": self.tile_size,
+            "overlap": self.overlap,
+            "levels": levels,
+            "format": self.format,
+            "tile_count": tile_count,
+        }
+
+    def _generate_levels(
+        self,
+        image: Image.Image,
+        output_dir: str,
+        levels: int,
+        executor: ThreadPoolExecutor,
+        progress_callback: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Write the tiles of every pyramid level, returning the tile count.
+
+        Levels are built from full size (levels-1) down to 0, each one by
+        halving the previous level, so the source is only resampled at
+        half size rather than once per level.
+        """
         tile_count = 0
-        for level in range(levels):
+        level_image = image
+
+        for done, level in enumerate(reversed(range(levels))):
             level_dir = Path(output_dir) / str(level)
             level_dir.mkdir(exist_ok=True)
 
-            # Scale factor for this level (0 = smallest, levels-1 = full size)
-            scale = 2 ** (levels - level - 1)
-            level_width = max(1, width // scale)
-            level_height = max(1, height // scale)
-
-            # Resize image for this level
-            if scale > 1:
-                level_image = image.resize(
-                    (level_width, level_height),
-                    Image.Resampling.LANCZOS
-                )
-            else:
-                level_image = image
+            # Halve the previous (larger) level; level sizes stay
+            # max(1, full_size // 2 ** (levels - level - 1))
+            if done:
+                level_image = self._halve(level_image)
+            level_width, level_height = level_image.size
 
             # Calculate tile grid
             cols = math.ceil(level_width / self.tile_size)
             rows = math.ceil(level_height / self.tile_size)
 
-            # Extract and save tiles
+            # Tile bounds and output paths for this level
+            tasks = []
             for y in range(rows):
                 for x in range(cols):
-                    # Calculate tile bounds
                     left = x * self.tile_size
                     top = y * self.tile_size
                     right = min(left + self.tile_size, level_width)
@@ -104,34 +167,54 @@ class TileService:
                     if right <= left or bottom <= top:
                         continue
 
-                    # Extract tile
-                    tile = level_image.crop((left, top, right, bottom))
-
-                    # Save tile
                     tile_path = level_dir / f"{x}_{y}.{self.format}"
-                    if self.format == "png":
-                        tile.save(str(tile_path), "PNG", optimize=True)
-                    elif self.format == "webp":
-                        tile.save(str(tile_path), "WEBP", quality=self.quality, method=4)
-                    else:
-                        tile.save(str(tile_path), "JPEG", quality=self.quality, optimize=True)
+                    tasks.append(((left, top, right, bottom), str(tile_path)))
 
-                    tile_count += 1
+            # Crop and encode tiles in parallel; list() re-raises worker errors
+            webp_method = WEBP_METHOD if level == levels - 1 else WEBP_OVERVIEW_METHOD
+            list(executor.map(
+                lambda task: self._save_tile(level_image, *task, webp_method), tasks
+            ))
+            tile_count += len(tasks)
 
             # Progress callback
             if progress_callback:
-                percent = int((level + 1) / levels * 100)
+                percent = int((done + 1) / levels * 100)
                 progress_callback(percent)
 
-        return {
-            "width": width,
-            "height": height,
-            "tile_size": self.tile_size,
-            "overlap": self.overlap,
-            "levels": levels,
-            "format": self.format,
-            "tile_count": tile_count,
-        }
+        return tile_count
+
+    def _halve(self, image: Image.Image) -> Image.Image:
+        """Downscale an image to (max(1, w // 2), max(1, h // 2))."""
+        half_width, half_height = image.width // 2, image.height // 2
+
+        if half_width and half_height:
+            # Integer 2x2 box reduce over the even-sized area: much cheaper
+            # than a LANCZOS resize and allocates only the output
+            return image.reduce(2, box=(0, 0, half_width * 2, half_height * 2))
+
+        # 1-pixel-wide/tall edge case of a very elongated image
+        return image.resize(
+            (max(1, half_width), max(1, half_height)),
+            Image.Resampling.LANCZOS
+        )
+
+    def _save_tile(
+        self,
+        level_image: Image.Image,
+        box: Tuple[int, int, int, int],
+        tile_path: str,
+        webp_method: int = WEBP_METHOD,
+    ) -> None:
+        """Crop one tile from a level image and encode it to disk."""
+        tile = level_image.crop(box)
+
+        if self.format == "png":
+            tile.save(tile_path, "PNG", optimize=True)
+        elif self.format == "webp":
+            tile.save(tile_path, "WEBP", quality=self.quality, method=webp_method)
+        else:
+            tile.save(tile_path, "JPEG", quality=self.quality, optimize=True)
 
     def generate_dzi_xml(
         self,
@@ -0,0 +1,4 @@
+"""Pytest root for the admin API - puts the `app` package on sys.path."""
+
+# Manual scripts that need a running API / real storage, not unit tests
+collect_ignore = ["scripts", "test_e2e_build.py"]
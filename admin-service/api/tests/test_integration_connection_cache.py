@@ -0,0 +1,142 @@
+"""Tests for the short-lived test_connection result cache."""
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services import integration_service
+from app.services.integration_service import IntegrationService
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+class FakeClient:
+    """Records GETs and answers with a fixed status."""
+
+    def __init__(self, status_code: int = 200):
+        self.status_code = status_code
+        self.calls = []
+
+    async def get(self, url, headers=None, timeout=None):
+        self.calls.append(url)
+        return SimpleNamespace(status_code=self.status_code, content=b'[{"id": 1}]')
+
+
+def make_config(**overrides):
+    values = dict(
+        id=uuid4(),
+        api_base_url="https://client.example.com/",
+        status_endpoint="/units",
+        updated_at=datetime(2024, 1, 1),
+        auth_type="none",
+        auth_credentials=None,
+        timeout_seconds=5,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(integration_service, "time", clock)
+    monkeypatch.setattr(integration_service, "_connection_tests", {})
+    return clock
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(integration_service, "get_client", lambda: client)
+    return client
+
+
+def make_service(config):
+    service = IntegrationService(db=None)
+
+    async def get_config(project_slug):
+        return config
+
+    service.get_config = get_config
+    return service
+
+
+def run_test(service, **kwargs):
+    return asyncio.run(service.test_connection("alpha", **kwargs))
+
+
+def test_success_is_reused_within_ttl(clock, client):
+    service = make_service(make_config())
+
+    first = run_test(service)
+    clock.now += integration_service.CONNECTION_TEST_CACHE_TTL - 0.1
+    second = run_test(service)
+
+    assert first["success"] is True
+    assert second is first
+    assert client.calls == ["https://client.example.com/units"]
+
+
+def test_success_expires_after_ttl(clock, client):
+    service = make_service(make_config())
+
+    run_test(service)
+    clock.now += integration_service.CONNECTION_TEST_CACHE_TTL
+    run_test(service)
+
+    assert len(client.calls) == 2
+
+
+def test_config_update_misses_cache(clock, client):
+    config = make_config()
+    service = make_service(config)
+
+    run_test(service)
+    config.updated_at = datetime(2024, 1, 2)
+    run_test(service)
+
+    assert len(client.calls) == 2
+
+
+def test_override_url_is_cached_separately(clock, client):
+    service = make_service(make_config())
+
+    run_test(service)
+    run_test(service, override_endpoint="/units/v2")
+
+    assert client.calls == [
+        "https://client.example.com/units",
+        "https://client.example.com/units/v2",
+    ]
+
+
+def test_failures_are_not_cached(clock, client):
+    client.status_code = 503
+    service = make_service(make_config())
+
+    assert run_test(service)["success"] is False
+    assert run_test(service)["success"] is False
+    assert len(client.calls) == 2
+    assert integration_service._connection_tests == {}
+
+
+def test_expired_entries_are_pruned_on_store(clock, client):
+    service = make_service(make_config())
+    run_test(service)
+
+    clock.now += integration_service.CONNECTION_TEST_CACHE_TTL
+    other = make_service(make_config())
+    run_test(other)
+
+    assert len(integration_service._connection_tests) == 1
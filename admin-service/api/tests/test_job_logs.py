@@ -0,0 +1,56 @@
+"""Tests for job log entry rendering."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.job import Job, format_log_entry
+from app.schemas.job import LogEntry
+
+EPOCH = datetime(1970, 1, 1)
+
+
+@pytest.mark.parametrize("when", [
+    datetime(2023, 11, 14, 22, 13, 20),
+    datetime(2023, 11, 14, 22, 13, 20, 123456),
+    datetime(2024, 2, 29, 23, 59, 59, 999999),
+    datetime(2038, 1, 19, 3, 14, 8, 1),
+])
+def test_epoch_ns_round_trips_to_iso(when):
+    # Same string the old utcnow().isoformat() entries carried
+    t = (when - EPOCH) // timedelta(microseconds=1) * 1000
+
+    entry = format_log_entry({"t": t, "level": "info", "message": "Started"})
+
+    assert entry == {
+        "timestamp": when.isoformat(),
+        "level": "info",
+        "message": "Started",
+    }
+
+
+def test_legacy_entry_passes_through():
+    entry = {"timestamp": "2023-11-14T22:13:20.123456", "level": "error", "message": "x"}
+
+    assert format_log_entry(entry) is entry
+
+
+def test_log_entry_schema_formats_stored_time():
+    stored = {"t": 1_700_000_000_123_456_000, "level": "warning", "message": "Slow"}
+
+    assert LogEntry.model_validate(stored).model_dump() == {
+        "timestamp": "2023-11-14T22:13:20.123456",
+        "level": "warning",
+        "message": "Slow",
+    }
+
+
+def test_job_to_dict_formats_logs():
+    job = Job(logs=[
+        {"t": 1_700_000_000_000_000_000, "level": "info", "message": "New"},
+        {"timestamp": "2023-11-14T22:00:00", "level": "info", "message": "Old"},
+    ])
+
+    assert job.to_dict()["logs"] == [
+        {"timestamp": "2023-11-14T22:13:20", "level": "info", "message": "New"},
+        {"timestamp": "2023-11-14T22:00:00", "level": "info", "message": "Old"},
+    ]
@@ -0,0 +1,81 @@
+"""Tests for bulk overlay upsert bookkeeping (statement execution stubbed)."""
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+from sqlalchemy.exc import DBAPIError
+
+from app.schemas.overlay import BulkOverlayItem
+from app.services.overlay_service import OverlayService
+
+
+class FakeSession:
+    async def commit(self):
+        pass
+
+
+def make_service(existing_refs=(), failing_refs=()):
+    """Service whose upserts treat `existing_refs` as stored rows."""
+    service = OverlayService(db=FakeSession())
+    project = SimpleNamespace(id=uuid4())
+    stored = set(existing_refs)
+    service.saved = []
+
+    async def load_project_for_write(project_slug):
+        return project, True
+
+    async def upsert_rows(rows):
+        if any(row["ref"] in failing_refs for row in rows):
+            raise DBAPIError("INSERT", {}, Exception("bad row"))
+        created = updated = 0
+        for row in rows:
+            if row["ref"] in stored:
+                updated += 1
+            else:
+                created += 1
+                stored.add(row["ref"])
+            service.saved.append(row)
+        return created, updated
+
+    service._load_project_for_write = load_project_for_write
+    service._upsert_rows = upsert_rows
+    return service
+
+
+def item(ref, label=None):
+    return BulkOverlayItem(
+        overlay_type="unit", ref=ref, geometry={"type": "path", "d": "M 0 0"},
+        label=label,
+    )
+
+
+def test_repeated_ref_counts_as_update_and_last_copy_wins():
+    service = make_service()
+
+    result = asyncio.run(service.bulk_upsert("alpha", [
+        item("u1", {"en": "first"}),
+        item("u2"),
+        item("u1", {"en": "second"}),
+    ]))
+
+    assert result == (2, 1, [])
+    assert [row["label"] for row in service.saved if row["ref"] == "u1"] == [
+        {"en": "second"}
+    ]
+
+
+def test_repeated_existing_ref_counts_each_copy_as_update():
+    service = make_service(existing_refs={"u1"})
+
+    assert asyncio.run(service.bulk_upsert("alpha", [item("u1"), item("u1")])) == (0, 2, [])
+
+
+def test_failing_row_is_reported_and_rest_are_saved():
+    service = make_service(failing_refs={"u2"})
+
+    created, updated, errors = asyncio.run(service.bulk_upsert("alpha", [
+        item("u1"), item("u2"), item("u3"),
+    ]))
+
+    assert (created, updated) == (2, 0)
+    assert [(e.index, e.ref) for e in errors] == [(1, "u2")]
@@ -0,0 +1,117 @@
+"""Tests for the project slug -> ID cache."""
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.lib import project_cache
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeSession:
+    """Stands in for AsyncSession: `get` by ID, `scalar` for the slug query."""
+
+    def __init__(self, *projects):
+        self.projects = {p.id: p for p in projects}
+        self.gets = 0
+        self.scalars = 0
+
+    async def get(self, model, project_id):
+        self.gets += 1
+        return self.projects.get(project_id)
+
+    async def scalar(self, statement, params):
+        self.scalars += 1
+        for project in self.projects.values():
+            if project.slug == params["slug"] and project.is_active:
+                return project
+        return None
+
+
+def make_project(slug: str, is_active: bool = True):
+    return SimpleNamespace(id=uuid4(), slug=slug, is_active=is_active)
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(project_cache, "time", SimpleNamespace(monotonic=clock))
+    monkeypatch.setattr(project_cache, "_slug_to_id", {})
+    return clock
+
+
+def test_entry_expires_after_ttl(clock):
+    project_id = uuid4()
+    project_cache.set_project_id("alpha", project_id)
+
+    clock.now += project_cache.SLUG_CACHE_TTL
+    assert project_cache.get_project_id_by_slug("alpha") == project_id
+
+    clock.now += 0.001
+    assert project_cache.get_project_id_by_slug("alpha") is None
+    assert "alpha" not in project_cache._slug_to_id
+
+
+def test_invalidate_drops_entry():
+    project_cache.set_project_id("alpha", uuid4())
+    project_cache.invalidate_project_slug("alpha")
+    # Invalidating a missing slug is a no-op
+    project_cache.invalidate_project_slug("alpha")
+
+    assert project_cache.get_project_id_by_slug("alpha") is None
+
+
+def test_active_project_lookup_uses_cache_after_first_query():
+    project = make_project("alpha")
+    db = FakeSession(project)
+
+    assert asyncio.run(project_cache.get_active_project_by_slug(db, "alpha")) is project
+    assert asyncio.run(project_cache.get_active_project_by_slug(db, "alpha")) is project
+
+    assert db.scalars == 1
+    assert db.gets == 1
+
+
+def test_active_project_lookup_requeries_after_expiry(clock):
+    project = make_project("alpha")
+    db = FakeSession(project)
+
+    asyncio.run(project_cache.get_active_project_by_slug(db, "alpha"))
+    clock.now += project_cache.SLUG_CACHE_TTL + 1
+    asyncio.run(project_cache.get_active_project_by_slug(db, "alpha"))
+
+    assert db.scalars == 2
+    assert db.gets == 0
+
+
+def test_stale_entry_is_revalidated_against_row():
+    old = make_project("alpha")
+    db = FakeSession(old)
+    asyncio.run(project_cache.get_active_project_by_slug(db, "alpha"))
+
+    # Project renamed and another one took over the slug
+    old.slug = "renamed"
+    new = make_project("alpha")
+    db.projects[new.id] = new
+
+    assert asyncio.run(project_cache.get_active_project_by_slug(db, "alpha")) is new
+    assert project_cache.get_project_id_by_slug("alpha") == new.id
+
+
+def test_deactivated_project_is_not_returned_from_cache():
+    project = make_project("alpha")
+    db = FakeSession(project)
+    asyncio.run(project_cache.get_active_project_by_slug(db, "alpha"))
+
+    project.is_active = False
+
+    assert asyncio.run(project_cache.get_active_project_by_slug(db, "alpha")) is None
+    assert project_cache.get_project_id_by_slug("alpha") is None
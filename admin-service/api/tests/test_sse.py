@@ -0,0 +1,132 @@
+"""Tests for the SSE manager's per-subscriber buffering."""
+import asyncio
+
+from app.lib import sse
+from app.lib.sse import SSEManager, SSEMessage
+
+
+def drain(subscriber):
+    items = []
+    while not subscriber.queue.empty():
+        items.append(subscriber.queue.get_nowait().data["n"])
+    return items
+
+
+def test_encoded_message_wire_format():
+    message = SSEMessage(data={"progress": 50}, event="progress", id="7")
+
+    assert message.encode() == b'id: 7\nevent: progress\ndata: {"progress":50}\n\n'
+    assert message.encode() is message.encoded
+
+
+def test_full_queue_drops_oldest_message(monkeypatch):
+    monkeypatch.setattr(sse, "SUBSCRIBER_QUEUE_SIZE", 3)
+
+    async def scenario():
+        manager = SSEManager()
+        slow = await manager.subscribe("job:1")
+        counts = [
+            await manager.broadcast("job:1", SSEMessage(data={"n": n}))
+            for n in range(5)
+        ]
+        depth = await manager.get_queue_depth("job:1")
+        return counts, depth, drain(slow)
+
+    counts, depth, received = asyncio.run(scenario())
+
+    assert counts == [1] * 5
+    assert depth == 3
+    assert received == [2, 3, 4]
+
+
+def test_slow_subscriber_does_not_affect_others(monkeypatch):
+    monkeypatch.setattr(sse, "SUBSCRIBER_QUEUE_SIZE", 2)
+
+    async def scenario():
+        manager = SSEManager()
+        slow = await manager.subscribe("job:1")
+        fast = await manager.subscribe("job:1")
+        seen = []
+        for n in range(4):
+            await manager.broadcast("job:1", SSEMessage(data={"n": n}))
+            seen.extend(drain(fast))
+        return drain(slow), seen
+
+    slow_received, fast_received = asyncio.run(scenario())
+
+    assert slow_received == [2, 3]
+    assert fast_received == [0, 1, 2, 3]
+
+
+def test_coalesced_broadcast_sends_first_then_latest():
+    async def scenario():
+        manager = SSEManager()
+        subscriber = await manager.subscribe("job:1")
+        counts = [
+            await manager.broadcast_coalesced(
+                "job:1", SSEMessage(data={"n": n}), min_interval=0.05
+            )
+            for n in range(5)
+        ]
+        immediate = drain(subscriber)
+        await asyncio.sleep(0.1)
+        return counts, immediate, drain(subscriber), manager
+
+    counts, immediate, flushed, manager = asyncio.run(scenario())
+
+    assert counts == [1, 0, 0, 0, 0]
+    assert immediate == [0]
+    assert flushed == [4]
+    assert manager._pending == {}
+    assert manager._flush_tasks == {}
+
+
+def test_coalesced_broadcast_keys_are_independent():
+    async def scenario():
+        manager = SSEManager()
+        subscriber = await manager.subscribe("job:1")
+        await manager.broadcast_coalesced(
+            "job:1", SSEMessage(data={"n": 0}), key="progress", min_interval=10
+        )
+        await manager.broadcast_coalesced(
+            "job:1", SSEMessage(data={"n": 1}), key="log", min_interval=10
+        )
+        received = drain(subscriber)
+        manager.drop_coalesced("job:1")
+        return received
+
+    assert asyncio.run(scenario()) == [0, 1]
+
+
+def test_coalesced_broadcast_without_subscribers_is_dropped():
+    async def scenario():
+        manager = SSEManager()
+        count = await manager.broadcast_coalesced("job:1", SSEMessage(data={"n": 0}))
+        return count, manager
+
+    count, manager = asyncio.run(scenario())
+
+    assert count == 0
+    assert manager._pending == {}
+    assert manager._last_sent == {}
+
+
+def test_unsubscribing_last_client_cancels_pending_flush():
+    async def scenario():
+        manager = SSEManager()
+        subscriber = await manager.subscribe("job:1")
+        for n in range(2):
+            await manager.broadcast_coalesced(
+                "job:1", SSEMessage(data={"n": n}), min_interval=10
+            )
+        task = manager._flush_tasks[("job:1", "progress")]
+        await manager.unsubscribe("job:1", subscriber)
+        await asyncio.sleep(0)
+        return task, manager
+
+    task, manager = asyncio.run(scenario())
+
+    assert task.cancelled()
+    assert manager._pending == {}
+    assert manager._flush_tasks == {}
+    assert manager._last_sent == {}
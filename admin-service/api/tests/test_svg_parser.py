@@ -0,0 +1,104 @@
+"""Tests for the streaming SVG path parser."""
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.services import svg_parser as svg_parser_module
+from app.services.svg_parser import ParsedOverlay, SVGParserService
+
+SAMPLE_SVG = (Path(__file__).parent / "fixtures" / "sample_overlays.svg").read_text()
+
+# Output of the previous ET.fromstring-based parser on SAMPLE_SVG
+# (polylabel unavailable, so centroids are vertex means)
+BASELINE_OVERLAYS = [
+    ParsedOverlay(
+        id="zone-a",
+        path_data="M 10 10 L 110 10 L 110 60 L 10 60 Z",
+        centroid=(60.0, 35.0),
+        bounds=(10.0, 10.0, 110.0, 60.0),
+    ),
+    ParsedOverlay(
+        id="zone-b",
+        path_data="M 200 20 L 260 20 L 230 80 Z",
+        centroid=(230.0, 40.0),
+        bounds=(200.0, 20.0, 260.0, 80.0),
+    ),
+    ParsedOverlay(
+        id="unit-101",
+        path_data="M 20 120 L 60 120 L 60 160 L 20 160 Z",
+        centroid=(40.0, 140.0),
+        bounds=(20.0, 120.0, 60.0, 160.0),
+    ),
+    ParsedOverlay(
+        id="unit-102",
+        path_data="M 60.5 120 L 100.5 120 L 100.5 160.25 L 60.5 160.25 Z",
+        centroid=(80.5, 140.125),
+        bounds=(60.5, 120.0, 100.5, 160.25),
+    ),
+    ParsedOverlay(
+        id="path-4",
+        path_data="M 300 200 L 340 240",
+        centroid=(320.0, 220.0),
+        bounds=(300.0, 200.0, 340.0, 240.0),
+    ),
+    ParsedOverlay(
+        id="poi-gate",
+        path_data="M -5 -5 L 5 5",
+        centroid=(0.0, 0.0),
+        bounds=(-5.0, -5.0, 5.0, 5.0),
+    ),
+]
+
+
+@pytest.fixture(autouse=True)
+def no_polylabel(monkeypatch):
+    # Centroids must not depend on whether the optional package is installed
+    monkeypatch.setitem(sys.modules, "polylabel", None)
+
+
+@pytest.fixture
+def parser():
+    return SVGParserService()
+
+
+def test_parse_svg_matches_baseline(parser):
+    assert parser.parse_svg(SAMPLE_SVG) == BASELINE_OVERLAYS
+
+
+def test_parse_svg_full_matches_separate_calls(parser):
+    viewbox, width, height, overlays = parser.parse_svg_full(SAMPLE_SVG)
+
+    assert viewbox == "0 0 400 300" == parser.get_viewbox(SAMPLE_SVG)
+    assert (width, height) == (800.0, 600.0) == parser.get_dimensions(SAMPLE_SVG)
+    assert overlays == BASELINE_OVERLAYS
+
+
+def test_id_pattern_filters_paths(parser):
+    overlays = parser.parse_svg(SAMPLE_SVG, id_pattern="unit-")
+
+    assert [o.id for o in overlays] == ["unit-101", "unit-102"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64])
+def test_chunk_boundaries_do_not_change_output(parser, monkeypatch, chunk_size):
+    monkeypatch.setattr(svg_parser_module, "_PARSE_CHUNK_SIZE", chunk_size)
+
+    assert parser.parse_svg_full(SAMPLE_SVG) == (
+        "0 0 400 300", 800.0, 600.0, BASELINE_OVERLAYS
+    )
+
+
+def test_paths_without_namespace(parser):
+    content = SAMPLE_SVG.replace(' xmlns="http://www.w3.org/2000/svg"', "")
+
+    assert parser.parse_svg(content) == BASELINE_OVERLAYS
+
+
+def test_dimensions_fall_back_to_viewbox(parser):
+    content = '<svg viewBox="0 0 320 240"><path id="a" d="M 0 0 L 1 1"/></svg>'
+
+    _, width, height, overlays = parser.parse_svg_full(content)
+
+    assert (width, height) == (320.0, 240.0)
+    assert [o.id for o in overlays] == ["a"]